@@ -1,14 +1,18 @@
 from duet import duet
 import asyncio
+import gc
 import logging
 import os
+import sys
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 
 
-
+import httpx
+import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from models import (SiteStartupMode,
@@ -24,10 +28,48 @@ from routes.printer_routes import router as printer_router
 from utils.config import (get_ssl_private_key_temporary_path,
                            SSL_CERT_FILE, get_prototypes_dir,
                            get_model_path, get_model_options_path,
-                           DEVICE_TYPE, SUCCESS_LABEL,
-                           get_config, update_config, init_config)
+                           get_device_type, SUCCESS_LABEL,
+                           get_config, update_config, init_config,
+                           get_push_subscriptions)
+from utils.camera_state_manager import get_camera_state_manager
 from utils.inference_lib import get_inference_engine
+from utils.setup_utils import startup_mode_requirements_met, setup_ngrok_tunnel
+from utils.sse_utils import SSEBatcher
 from utils.cloudflare_utils import (start_cloudflare_tunnel, stop_cloudflare_tunnel)
+from utils.notification_utils import flush_subscriptions
+from utils.webrtc_utils import close_peer_connections
+
+async def _start_tunnel(app_instance: FastAPI) -> bool:
+    """
+    Start the configured tunnel in a worker thread while the server binds.
+
+    On failure the startup mode is switched back to SETUP and the server is
+    asked to exit, so run() restarts the process into setup mode.
+
+    Returns:
+        bool: True if the tunnel was established, False otherwise.
+    """
+    app_config = get_config()
+    site_domain = app_config.get(SavedConfig.SITE_DOMAIN, "")
+    match app_config.get(SavedConfig.TUNNEL_PROVIDER, None):
+        case TunnelProvider.NGROK:
+            logging.warning("Starting ngrok tunnel. Available at %s", site_domain)
+            tunnel_ok = await asyncio.to_thread(setup_ngrok_tunnel, close=False)
+        case TunnelProvider.CLOUDFLARE:
+            logging.warning("Starting Cloudflare tunnel.")
+            tunnel_ok = await asyncio.to_thread(start_cloudflare_tunnel)
+        case _:
+            tunnel_ok = False
+    app_instance.state.tunnel_ready = tunnel_ok
+    if tunnel_ok:
+        logging.warning("Tunnel started. Available at %s", site_domain)
+    else:
+        logging.error("Failed to establish tunnel. Restarting in SETUP mode.")
+        update_config({SavedConfig.STARTUP_MODE: SiteStartupMode.SETUP})
+        app_instance.state.restart_in_setup = True
+        if app_instance.state.server is not None:
+            app_instance.state.server.should_exit = True
+    return tunnel_ok
 
 @asynccontextmanager
 async def lifespan(app_instance: FastAPI):
@@ -36,16 +78,21 @@ async def lifespan(app_instance: FastAPI):
     
     Initializes the device and model, sets up camera indices, and handles startup modes.
     """
-    # pylint: disable=C0415
-    from utils.setup_utils import startup_mode_requirements_met
+    app_instance.state.http_async_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=5.0)
     startup_mode = startup_mode_requirements_met()
+    if startup_mode is SiteStartupMode.TUNNEL:
+        app_instance.state.tunnel_task = asyncio.create_task(_start_tunnel(app_instance))
     inference_engine = get_inference_engine()
     if startup_mode is SiteStartupMode.SETUP:
         logging.warning("Starting in setup mode. Detection model and device will not be initialized.")
         yield
+        await flush_subscriptions()
+        await app_instance.state.http_async_client.aclose()
         return
     logging.debug("Setting up device...")
-    app_instance.state.device = inference_engine.setup_device(DEVICE_TYPE)
+    app_instance.state.device = inference_engine.setup_device(get_device_type())
     logging.debug("Using device: %s", app_instance.state.device)
     try:
         logging.debug("Loading model...")
@@ -73,21 +120,33 @@ async def lifespan(app_instance: FastAPI):
         app_instance.state.model = None
         raise
     logging.debug("Camera indices set up successfully.")
+    # Startup objects (model, prototypes, routes) live for the whole process,
+    # so keep them out of the generational GC scans.
+    gc.collect()
+    gc.freeze()
     yield
     logging.debug("Cleaning up resources on shutdown...")
+    app_instance.state.polled_printers.clear()
+    if app_instance.state.printer_poll_task is not None:
+        app_instance.state.printer_poll_task.cancel()
+    if app_instance.state.tunnel_task is not None:
+        app_instance.state.tunnel_task.cancel()
+    await close_peer_connections()
+    await flush_subscriptions()
     try:
-        from utils.camera_state_manager import get_camera_state_manager
         manager = get_camera_state_manager()
         await manager.cleanup_all_resources()
         logging.debug("Cleaned up camera resources successfully.")
     except Exception as e:
         logging.error("Error during cleanup: %s", e)
+    await app_instance.state.http_async_client.aclose()
 
 app = FastAPI(
     title="PrintGuard",
     description="Real-time Defect Detection on Edge-devices",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -105,10 +164,26 @@ app.state.prototypes = None
 app.state.class_names = ['success', 'failure']
 app.state.defect_idx = -1
 app.state.alerts = {}
+app.state.active_alerts_cache = None
+app.state.alert_subscribers = set()
+app.state.alert_batcher = SSEBatcher(app.state.alert_subscribers)
 app.state.outbound_queue = asyncio.Queue()
-config = get_config() or {}
-app.state.subscriptions = config.get(SavedConfig.PUSH_SUBSCRIPTIONS, [])
-app.state.polling_tasks = {}
+app.state.subscriptions = {
+    sub['endpoint']: sub for sub in get_push_subscriptions()
+    if sub.get('endpoint')
+}
+app.state.subscriptions_dirty = asyncio.Event()
+app.state.subscription_flush_task = None
+app.state.polled_printers = {}
+app.state.printer_poll_task = None
+app.state.tunnel_task = None
+app.state.peer_connections = set()
+app.state.tunnel_ready = False
+app.state.server = None
+app.state.restart_in_setup = False
+app.state.octoprint_clients = {}
+app.state.live_detection_tasks = set()
+app.state.index_cache = None
 
 if app.debug:
     logging.basicConfig(level=logging.DEBUG)
@@ -146,7 +221,7 @@ async def http_redirect_middleware(request: Request, call_next):
 
 def run():
     logging.warning(f'duet config values')
-    for key, val in duet.items():
+    for key, val in asdict(duet).items():
         logging.warning(f'{key} = {val}')
     print(f'app PORT is {duet.PORT}')
 
@@ -154,15 +229,10 @@ def run():
 
     Run the FastAPI application with uvicorn, handling different startup modes.
     """
-    # pylint: disable=C0415
-    import uvicorn
-    from utils.setup_utils import (startup_mode_requirements_met,
-                                    setup_ngrok_tunnel)
     init_config()
     startup_mode = startup_mode_requirements_met()
     app_config = get_config()
     site_domain = app_config.get(SavedConfig.SITE_DOMAIN, "")
-    tunnel_provider = app_config.get(SavedConfig.TUNNEL_PROVIDER, None)
     """SRS"""
     if not duet.DWC:
         stop_cloudflare_tunnel()
@@ -198,27 +268,14 @@ def run():
                             )
             """/SRS"""
         case SiteStartupMode.TUNNEL:
-            match tunnel_provider:
-                case TunnelProvider.NGROK:
-                    logging.warning(
-                        "Starting in tunnel mode with ngrok. Available at %s",
-                        site_domain)
-                    tunnel_setup = setup_ngrok_tunnel(close=False)
-                    if not tunnel_setup:
-                        logging.error("Failed to establish ngrok tunnel. Starting in SETUP mode.")
-                        update_config({SavedConfig.STARTUP_MODE: SiteStartupMode.SETUP})
-                        run()
-                    else:
-                        uvicorn.run(app, host="0.0.0.0", port=8000)
-                case TunnelProvider.CLOUDFLARE:
-                    logging.warning("Starting in tunnel mode with Cloudflare.")
-                    if start_cloudflare_tunnel():
-                        logging.warning("Cloudflare tunnel started. Available at %s", site_domain)
-                        uvicorn.run(app, host="0.0.0.0", port=8000)
-                    else:
-                        logging.error("Failed to start Cloudflare tunnel. Starting in SETUP mode.")
-                        update_config({SavedConfig.STARTUP_MODE: SiteStartupMode.SETUP})
-                        run()
+            # The tunnel itself is started by the lifespan handler
+            logging.warning("Starting in tunnel mode.")
+            app.state.server = uvicorn.Server(uvicorn.Config(app, host="0.0.0.0", port=8000))
+            app.state.server.run()
+            if app.state.restart_in_setup:
+                # Loop-bound app state cannot be reused by a second server in
+                # this process, so start afresh; the saved mode is now SETUP.
+                os.execv(sys.executable, [sys.executable, *sys.argv])
 
 if __name__ == "__main__":
     run()
@@ -7,6 +7,8 @@ from (.)duet import duet
  duet.<variable name>
 
 """
+from dataclasses import make_dataclass
+
 ### ---------- ONLY CHANGE ENTRIES BETWEEN { and } -----------###
 """
 duet = {
@@ -31,15 +33,6 @@ duet = {
 ### ------------ DO NOT CHANGE BELOW HERE ------  ###
 
 ### ---------DO NOT CHANGE -------------------###
-class dotdict(dict):
-    """dot.notation access to dictionary attributes"""
-    __getattr__ = dict.get
-    __setattr__ = dict.__setitem__
-    __delattr__ = dict.__delitem__
-
-duet = dotdict(duet)
-
-
-
-
-
+# dot.notation access to the values above; unknown names raise AttributeError
+DuetConfig = make_dataclass("DuetConfig", list(duet), slots=True, frozen=True)
+duet = DuetConfig(**duet)
@@ -1,11 +1,17 @@
 import asyncio
+from collections import deque
 from enum import Enum
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, field_validator, Field
+from typing import List, Optional, Dict, Any, Deque
+from pydantic import BaseModel, field_validator, field_serializer, Field
+from utils.defaults import (BRIGHTNESS, CONTRAST, FOCUS, SENSITIVITY,
+                            COUNTDOWN_TIME, COUNTDOWN_ACTION,
+                            DETECTION_VOTING_THRESHOLD, DETECTION_VOTING_WINDOW,
+                            MAX_CAMERA_HISTORY)
 
 class Alert(BaseModel):
     id: str
-    snapshot: bytes
+    # Served separately from /alert/{id}/snapshot
+    snapshot: bytes = Field(exclude=True, repr=False)
     title: str
     message: str
     timestamp: float
@@ -37,24 +43,16 @@ class Notification(BaseModel):
     badge_url: Optional[str] = None
     actions: List[NotificationAction] = []
 
-def _get_config_value(key: str):
-    # pylint: disable=import-outside-toplevel
-    from .utils.config import (BRIGHTNESS, CONTRAST,
-                              FOCUS, SENSITIVITY,
-                              COUNTDOWN_TIME, COUNTDOWN_ACTION,
-                              DETECTION_VOTING_THRESHOLD,
-                              DETECTION_VOTING_WINDOW)
-    config_map = {
-        'BRIGHTNESS': BRIGHTNESS,
-        'CONTRAST': CONTRAST,
-        'FOCUS': FOCUS,
-        'SENSITIVITY': SENSITIVITY,
-        'COUNTDOWN_TIME': COUNTDOWN_TIME,
-        'COUNTDOWN_ACTION': COUNTDOWN_ACTION,
-        'DETECTION_VOTING_THRESHOLD': DETECTION_VOTING_THRESHOLD,
-        'DETECTION_VOTING_WINDOW': DETECTION_VOTING_WINDOW,
-    }
-    return config_map[key]
+_CAMERA_STATE_DEFAULTS = {
+    'brightness': BRIGHTNESS,
+    'contrast': CONTRAST,
+    'focus': FOCUS,
+    'sensitivity': SENSITIVITY,
+    'countdown_time': COUNTDOWN_TIME,
+    'countdown_action': COUNTDOWN_ACTION,
+    'majority_vote_threshold': DETECTION_VOTING_THRESHOLD,
+    'majority_vote_window': DETECTION_VOTING_WINDOW,
+}
 
 class FileInfo(BaseModel):
     name: Optional[str] = None
@@ -62,6 +60,11 @@ class FileInfo(BaseModel):
     size: Optional[int] = None
     date: Optional[int] = None
 
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
+
 
 class Progress(BaseModel):
     completion: Optional[float] = None
@@ -69,6 +72,11 @@ class Progress(BaseModel):
     printTime: Optional[int] = None
     printTimeLeft: Optional[int] = None
 
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
+
 
 class JobInfoResponse(BaseModel):
     job: Dict = Field(default_factory=dict)
@@ -77,6 +85,7 @@ class JobInfoResponse(BaseModel):
     error: Optional[str] = None
 
     model_config = {
+        "frozen": True,
         "extra": "ignore"
     }
 
@@ -86,26 +95,54 @@ class TemperatureReading(BaseModel):
     target: Optional[float]
     offset: Optional[float]
 
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
+
 
-class TemperatureReadings(BaseModel):
-    temperature: Dict[str, TemperatureReading]
-    
 class PrinterTemperatures(BaseModel):
     nozzle_actual: Optional[float] = None
     nozzle_target: Optional[float] = None
     bed_actual: Optional[float] = None
     bed_target: Optional[float] = None
 
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
+
 class PrinterState(BaseModel):
     jobInfoResponse: Optional[JobInfoResponse] = None
     temperatureReading: Optional[PrinterTemperatures] = None
 
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
+
+class DuetStatus(BaseModel):
+    state: Dict = Field(default_factory=dict)
+    job: Dict = Field(default_factory=dict)
+    heat: Dict = Field(default_factory=dict)
+    tools: List[Dict] = Field(default_factory=list)
+
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
+
 class CurrentPayload(BaseModel):
     state: dict
     job: Any
     progress: Progress
     temps: Optional[list] = Field(None, alias="temps")
 
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
+
 class PrinterType(str, Enum):
     OCTOPRINT = "octoprint"
 
@@ -128,7 +165,8 @@ class CameraState(BaseModel):
     source: str
     lock: asyncio.Lock = Field(default_factory=asyncio.Lock, exclude=True)
     current_alert_id: Optional[str] = None
-    detection_history: List[tuple] = []
+    detection_history: Deque[tuple] = Field(
+        default_factory=lambda: deque(maxlen=MAX_CAMERA_HISTORY))
     live_detection_running: bool = False
     live_detection_task: Optional[str] = None
     last_result: Optional[str] = None
@@ -147,27 +185,22 @@ class CameraState(BaseModel):
     printer_config: Optional[Dict] = None
 
     def __init__(self, **data):
-        if 'brightness' not in data:
-            data['brightness'] = _get_config_value('BRIGHTNESS')
-        if 'contrast' not in data:
-            data['contrast'] = _get_config_value('CONTRAST')
-        if 'focus' not in data:
-            data['focus'] = _get_config_value('FOCUS')
-        if 'sensitivity' not in data:
-            data['sensitivity'] = _get_config_value('SENSITIVITY')
-        if 'countdown_time' not in data:
-            data['countdown_time'] = _get_config_value('COUNTDOWN_TIME')
-        if 'countdown_action' not in data:
-            data['countdown_action'] = _get_config_value('COUNTDOWN_ACTION')
-        if 'majority_vote_threshold' not in data:
-            data['majority_vote_threshold'] = _get_config_value('DETECTION_VOTING_THRESHOLD')
-        if 'majority_vote_window' not in data:
-            data['majority_vote_window'] = _get_config_value('DETECTION_VOTING_WINDOW')
+        for key, value in _CAMERA_STATE_DEFAULTS.items():
+            data.setdefault(key, value)
         super().__init__(**data)
     model_config = {
         "arbitrary_types_allowed": True
     }
 
+    @field_validator('detection_history', mode='after')
+    @classmethod
+    def bound_detection_history(cls, v):
+        return deque(v, maxlen=MAX_CAMERA_HISTORY)
+
+    @field_serializer('detection_history')
+    def serialize_detection_history(self, v):
+        return list(v)
+
 class VapidSettings(BaseModel):
     public_key: str
     private_key: str
@@ -208,6 +241,7 @@ class SetupCompletion(BaseModel):
 class SavedKey(str, Enum):
     VAPID_PRIVATE_KEY = "vapid_private_key"
     SSL_PRIVATE_KEY = "ssl_private_key"
+    SSL_CA_PRIVATE_KEY = "ssl_ca_private_key"
     TUNNEL_API_KEY = "tunnel_api_key"
     TUNNEL_TOKEN = "tunnel_token"
 
@@ -259,6 +293,10 @@ class WarpDeviceEnrollmentRule(BaseModel):
     require: List[str] = []
     include: List[str] = []
 
+class WebRTCOffer(BaseModel):
+    sdp: str
+    type: str
+
 class FeedSettings(BaseModel):
     stream_max_fps: int
     stream_tunnel_fps: int
@@ -269,9 +307,3 @@ class FeedSettings(BaseModel):
     printer_stat_polling_rate_ms: int
     min_sse_dispatch_delay_ms: int
 
-class PollingTask(BaseModel):
-    task: Optional[asyncio.Task] = None
-    stop_event: Optional[asyncio.Event] = None
-    model_config = {
-        "arbitrary_types_allowed": True
-    }
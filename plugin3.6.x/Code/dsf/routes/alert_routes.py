@@ -1,20 +1,35 @@
-import json
-from fastapi import APIRouter, Body, Request
+from fastapi import APIRouter, Body, HTTPException, Request, Response
+from sse_starlette.sse import EventSourceResponse
 from models import AlertAction
-from utils.alert_utils import (alert_to_response_json, dismiss_alert,
-                                 get_alert)
+from utils.alert_utils import (dismiss_alert, get_active_alerts_json,
+                                 get_alert, get_alert_snapshot)
 from utils.printer_utils import suspend_print_job
+from utils.sse_utils import add_alert_subscriber, remove_alert_subscriber
 
 router = APIRouter()
 
+# pylint: disable=unused-argument
+async def _handle_dismiss(alert_id, camera_uuid, action):
+    """Dismiss an alert without touching the printer."""
+    return await dismiss_alert(alert_id) or {"message": f"Alert {alert_id} not found."}
+
+async def _handle_suspend(alert_id, camera_uuid, action):
+    """Pause or cancel the camera's print job, then dismiss the alert."""
+    await suspend_print_job(camera_uuid, action)
+    return await dismiss_alert(alert_id)
+
+_ALERT_HANDLERS = {
+    AlertAction.DISMISS: _handle_dismiss,
+    AlertAction.CANCEL_PRINT: _handle_suspend,
+    AlertAction.PAUSE_PRINT: _handle_suspend,
+}
+
 @router.post("/alert/dismiss")
-async def alert_response(request: Request,
-                         alert_id: str = Body(..., embed=True),
+async def alert_response(alert_id: str = Body(..., embed=True),
                          action: AlertAction = Body(..., embed=True)):
     """Handle alert response actions including dismiss, cancel, and pause.
 
     Args:
-        request (Request): The FastAPI request object.
         alert_id (str): Unique identifier of the alert to act upon.
         action (AlertAction): The action to perform on the alert.
 
@@ -25,28 +40,57 @@ async def alert_response(request: Request,
     camera_uuid = alert.camera_uuid if alert else None
     if not alert or camera_uuid is None:
         return {"message": f"Alert {alert_id} not found."}
-    response = None
-    match action:
-        case AlertAction.DISMISS:
-            response = await dismiss_alert(alert_id)
-        case AlertAction.CANCEL_PRINT | AlertAction.PAUSE_PRINT:
-            suspend_print_job(camera_uuid, action)
-            return await dismiss_alert(alert_id)
-    if not response:
-        response = {"message": f"Alert {alert_id} not found."}
-    return response
+    handler = _ALERT_HANDLERS.get(action)
+    if handler is None:
+        return {"message": f"Alert {alert_id} not found."}
+    return await handler(alert_id, camera_uuid, action)
 
 @router.get("/alert/active")
-async def get_active_alerts(request: Request):
+async def get_active_alerts():
     """Retrieve all currently active alerts.
 
+    Returns:
+        Response: JSON body containing a list of active alerts with their details.
+    """
+    return Response(content=get_active_alerts_json(),
+                    media_type="application/json")
+
+@router.get("/alert/{alert_id}/snapshot")
+async def get_alert_snapshot_image(alert_id: str):
+    """Serve the snapshot image captured for an alert.
+
+    Args:
+        alert_id (str): Unique identifier of the alert.
+
+    Returns:
+        Response: The snapshot as a JPEG image.
+    """
+    snapshot = await get_alert_snapshot(alert_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found.")
+    return Response(content=snapshot, media_type="image/jpeg")
+
+@router.get("/alert/stream")
+async def alert_stream(request: Request):
+    """Stream alert additions and dismissals as Server-Sent Events.
+
+    Mutations are batched by app.state.alert_batcher and delivered as JSON
+    arrays, so clients can apply deltas instead of polling /alert/active.
+
     Args:
-        request (Request): The FastAPI request object containing app state.
+        request (Request): The FastAPI request object for connection management.
 
     Returns:
-        dict: Dictionary containing a list of active alerts with their details.
+        EventSourceResponse: SSE stream of batched alert events.
     """
-    alerts = []
-    for alert in request.app.state.alerts.values():
-        alerts.append(json.loads(alert_to_response_json(alert)))
-    return {"active_alerts": alerts}
+    queue = add_alert_subscriber()
+    async def send_events():
+        try:
+            while True:
+                batch = await queue.get()
+                if await request.is_disconnected():
+                    break
+                yield batch
+        finally:
+            remove_alert_subscriber(queue)
+    return EventSourceResponse(send_events())
@@ -1,16 +1,19 @@
+import asyncio
 import logging
 import time
-import uuid
 
 import cv2  # pylint: disable=E0401
 from fastapi import APIRouter, Body, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
+from models import WebRTCOffer
 from utils.camera_utils import (add_camera, find_available_serial_cameras,
-                                  get_camera_state)
+                                  get_camera_state, invalidate_serial_camera_cache)
 from utils.camera_utils import remove_camera as remove_camera_util
+from utils.config import PREVIEW_JPEG_QUALITY, PREVIEW_MAX_FPS
 from utils.shared_video_stream import get_shared_stream_manager
 from utils.stream_utils import generate_frames
+from utils.webrtc_utils import create_webrtc_answer, is_webrtc_available
 
 router = APIRouter()
 
@@ -116,59 +119,104 @@ async def remove_camera_ep(request: Request):
     return {"message": "Camera removed successfully."}
 
 @router.get("/camera/serial_devices")
-async def get_serial_devices_ep():
-    """Get a list of available serial devices."""
+async def get_serial_devices_ep(refresh: bool = False):
+    """Get a list of available serial devices.
+
+    Args:
+        refresh (bool): If True, discard cached results and probe again.
+    """
+    if refresh:
+        invalidate_serial_camera_cache()
     devices = find_available_serial_cameras()
     return devices
 
-def generate_preview_frames(source: str):
+async def generate_preview_frames(source: str, request: Request):
     """Generate frames for camera preview using shared video stream.
+
+    Every preview of the same source shares one stream. Each client waits
+    on its own event for new frames, and a frame is JPEG-encoded once no
+    matter how many clients are watching.
+
+    Frames are paced to PREVIEW_MAX_FPS, counting the time spent encoding
+    and sending. Only the newest frame is ever read, so a slow client skips
+    frames instead of falling behind.
     
     Args:
         source (str): The camera source (device path or RTSP URL).
+        request (Request): The client request, used to stop on disconnect.
         
     Yields:
         bytes: Multipart JPEG frame data.
     """
-    preview_uuid = f"preview_{uuid.uuid4()}"
+    preview_uuid = f"preview_{source}"
     manager = get_shared_stream_manager()
+    frame_event = asyncio.Event()
+    stream = None
     try:
-        stream = manager.get_stream(preview_uuid, source)
-        max_wait = 50
-        wait_count = 0
-        while not stream.is_frame_available() and wait_count < max_wait:
-            time.sleep(0.1)
-            wait_count += 1
+        stream = await asyncio.to_thread(manager.acquire_stream, preview_uuid, source)
+        stream.add_frame_listener(frame_event)
         if not stream.is_frame_available():
-            logging.error("Failed to get initial frame from source: %s", source)
-            return
-        while True:
-            frame = stream.get_frame()
-            if frame is None:
-                logging.warning("Failed to get frame from source: %s", source)
-                time.sleep(0.1)
-                continue
-            _, buffer = cv2.imencode('.jpg', frame)
-            frame_bytes = buffer.tobytes()
-            yield (b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            time.sleep(0.2) 
+            try:
+                await asyncio.wait_for(frame_event.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                logging.error("Failed to get initial frame from source: %s", source)
+                return
+        frame_interval = 1.0 / PREVIEW_MAX_FPS
+        while not await request.is_disconnected():
+            frame_event.clear()
+            started = time.monotonic()
+            frame_bytes = await asyncio.to_thread(stream.get_encoded_jpeg, PREVIEW_JPEG_QUALITY)
+            if frame_bytes is not None:
+                yield (b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+            remaining = frame_interval - (time.monotonic() - started)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            try:
+                await asyncio.wait_for(frame_event.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                logging.warning("Preview stream for source %s stopped delivering frames", source)
+                return
     except (cv2.error, OSError, RuntimeError) as e:
         logging.error("Error in preview frame generation for source %s: %s", source, e)
     finally:
-        try:
-            manager.release_stream(preview_uuid)
-        except (AttributeError, RuntimeError) as cleanup_error:
-            logging.error("Error cleaning up preview stream %s: %s", preview_uuid, cleanup_error)
+        if stream is not None:
+            stream.remove_frame_listener(frame_event)
+            try:
+                manager.release_stream(preview_uuid)
+            except (AttributeError, RuntimeError) as cleanup_error:
+                logging.error("Error cleaning up preview stream %s: %s", preview_uuid, cleanup_error)
 
 @router.get('/camera/preview', include_in_schema=False)
-async def camera_preview(source: str):
+async def camera_preview(source: str, request: Request):
     """Stream live camera preview for a specific source without registration.
 
     Args:
         source (str): Camera source (device path or RTSP URL).
+        request (Request): The FastAPI request object.
 
     Returns:
         StreamingResponse: MJPEG streaming response with camera frames.
     """
-    return StreamingResponse(generate_preview_frames(source),
+    return StreamingResponse(generate_preview_frames(source, request),
                              media_type='multipart/x-mixed-replace; boundary=frame')
+
+@router.post('/camera/webrtc/{camera_uuid}', include_in_schema=False)
+async def camera_webrtc(camera_uuid: str, offer: WebRTCOffer):
+    """Answer a WebRTC offer with an H.264 video track of a camera.
+
+    This is an alternative to the MJPEG feed that needs aiortc installed.
+
+    Args:
+        camera_uuid (str): UUID of the camera to stream.
+        offer (WebRTCOffer): The browser's session description offer.
+
+    Returns:
+        dict: The session description answer with 'sdp' and 'type'.
+    """
+    if not is_webrtc_available():
+        raise HTTPException(status_code=501,
+                            detail="WebRTC streaming requires aiortc. Install with: pip install aiortc")
+    camera_state = await get_camera_state(camera_uuid)
+    if not camera_state or not camera_state.source:
+        raise HTTPException(status_code=404, detail=f"Camera {camera_uuid} not found.")
+    return await create_webrtc_answer(camera_uuid, camera_state.source, offer.sdp, offer.type)
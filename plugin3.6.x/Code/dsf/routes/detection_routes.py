@@ -1,16 +1,36 @@
 import asyncio
 import logging
 import time
+from collections import deque
 
-from fastapi import APIRouter, Body, File, HTTPException, Request, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Body, Request
 
 from utils.camera_utils import get_camera_state, update_camera_state
+from utils.config import MAX_CAMERA_HISTORY
 from utils.detection_utils import _live_detection_loop
-from duet import duet
 
 router = APIRouter()
 
+_ALREADY_RUNNING, _STARTED, _NOT_RUNNING, _STOPPED = range(4)
+_MESSAGE_TEMPLATES = (
+    "Live detection already running for camera {}",
+    "Live detection started for camera {}",
+    "Live detection not running for camera {}",
+    "Live detection stopped for camera {}",
+)
+
+def _msg(template_id, nickname):
+    """Build the message response for a template.
+
+    Args:
+        template_id (int): Index into _MESSAGE_TEMPLATES.
+        nickname (str): The camera nickname to format into the message.
+
+    Returns:
+        dict: {"message": str}.
+    """
+    return {"message": _MESSAGE_TEMPLATES[template_id].format(nickname)}
+
 @router.post("/detect/live/start")
 async def start_live_detection(request: Request, camera_uuid: str = Body(..., embed=True)):
     """Start continuous live detection on a specified camera.
@@ -24,29 +44,30 @@ async def start_live_detection(request: Request, camera_uuid: str = Body(..., em
     """
     camera_state = await get_camera_state(camera_uuid)
     if camera_state.live_detection_running:
-        return {"message": f"Live detection already running for camera {camera_state.nickname}"}
-    else:
-        await update_camera_state(camera_uuid, {
-            "current_alert_id": None,
-            "detection_history": [],
-            "last_result": None,
-            "last_time": None,
-            "error": None
-        })
-    await update_camera_state(camera_uuid, {"start_time": time.time(),
+        return _msg(_ALREADY_RUNNING, camera_state.nickname)
+    live_detection_task = asyncio.create_task(
+        _live_detection_loop(request.app.state, camera_uuid))
+    request.app.state.live_detection_tasks.add(live_detection_task)
+    live_detection_task.add_done_callback(request.app.state.live_detection_tasks.discard)
+    await update_camera_state(camera_uuid, {"current_alert_id": None,
+                                       "detection_history": deque(maxlen=MAX_CAMERA_HISTORY),
+                                       "last_result": None,
+                                       "last_time": None,
+                                       "error": None,
+                                       "start_time": time.monotonic(),
                                        "live_detection_running": True,
-                                       "live_detection_task": asyncio.create_task(
-                                           _live_detection_loop(request.app.state, camera_uuid)
-                                           )})
+                                       "live_detection_task": live_detection_task})
     print('LIVE DETECTION STARTED')
-    return {"message": f"Live detection started for camera {camera_state.nickname}"}
+    return _msg(_STARTED, camera_state.nickname)
 
 @router.post("/detect/live/stop")
-async def stop_live_detection(request: Request, camera_uuid: str = Body(..., embed=True)):
+async def stop_live_detection(camera_uuid: str = Body(..., embed=True)):
     """Stop continuous live detection on a specified camera.
 
+    The task removes itself from app.state.live_detection_tasks through the
+    done callback registered in start_live_detection.
+
     Args:
-        request (Request): The FastAPI request object containing app state.
         camera_uuid (str): UUID of the camera to stop live detection on.
 
     Returns:
@@ -54,7 +75,7 @@ async def stop_live_detection(request: Request, camera_uuid: str = Body(..., emb
     """
     camera_state = await get_camera_state(camera_uuid)
     if not camera_state.live_detection_running:
-        return {"message": f"Live detection not running for camera {camera_state.nickname}"}
+        return _msg(_NOT_RUNNING, camera_state.nickname)
     live_detection_task = camera_state.live_detection_task
     if live_detection_task:
         try:
@@ -62,8 +83,11 @@ async def stop_live_detection(request: Request, camera_uuid: str = Body(..., emb
             logging.debug("Live detection task for camera %s finished successfully.", camera_uuid)
         except asyncio.TimeoutError:
             logging.debug("Live detection task for camera %s did not finish in time.", camera_uuid)
-            if live_detection_task:
-                live_detection_task.cancel()
+            live_detection_task.cancel()
+            try:
+                await live_detection_task
+            except (asyncio.CancelledError, Exception):
+                pass
         except Exception as e:
             logging.error("Error stopping live detection task for camera %s: %s", camera_uuid, e)
         finally:
@@ -71,4 +95,4 @@ async def stop_live_detection(request: Request, camera_uuid: str = Body(..., emb
     await update_camera_state(camera_uuid, {"start_time": None,
                                     "live_detection_running": False,
                                     "live_detection_task": None})
-    return {"message": f"Live detection stopped for camera {camera_state.nickname}"}
+    return _msg(_STOPPED, camera_state.nickname)
@@ -3,7 +3,7 @@ import logging
 
 from fastapi import Form, Request, APIRouter
 from fastapi.exceptions import HTTPException
-from fastapi.responses import RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse
 
 from utils.config import (STREAM_MAX_FPS, STREAM_TUNNEL_FPS,
                             STREAM_JPEG_QUALITY, STREAM_MAX_WIDTH,
@@ -11,37 +11,46 @@ from utils.config import (STREAM_MAX_FPS, STREAM_TUNNEL_FPS,
                             MIN_SSE_DISPATCH_DELAY_MS,
                             update_config, get_config)
 from utils.camera_utils import update_camera_state
-from utils.camera_state_manager import get_camera_state_manager
 from utils.stream_utils import stream_optimizer
 from models import FeedSettings, SavedConfig
+from utils.app_ref import get_templates
 
 router = APIRouter()
 
+FEED_SETTINGS_CACHE_TTL_S = 1.0
+_cached_settings = None
+_SETTINGS_SPEC = (
+    ("stream_max_fps", SavedConfig.STREAM_MAX_FPS, STREAM_MAX_FPS),
+    ("stream_tunnel_fps", SavedConfig.STREAM_TUNNEL_FPS, STREAM_TUNNEL_FPS),
+    ("stream_jpeg_quality", SavedConfig.STREAM_JPEG_QUALITY, STREAM_JPEG_QUALITY),
+    ("stream_max_width", SavedConfig.STREAM_MAX_WIDTH, STREAM_MAX_WIDTH),
+    ("detection_interval_ms", SavedConfig.DETECTION_INTERVAL_MS, DETECTION_INTERVAL_MS),
+    ("printer_stat_polling_rate_ms", SavedConfig.PRINTER_STAT_POLLING_RATE_MS,
+     PRINTER_STAT_POLLING_RATE_MS),
+    ("min_sse_dispatch_delay_ms", SavedConfig.MIN_SSE_DISPATCH_DELAY_MS,
+     MIN_SSE_DISPATCH_DELAY_MS),
+)
+
 @router.get("/", include_in_schema=False)
 async def serve_index(request: Request):
-    """Serve the main index page with camera states and configuration.
+    """Serve the main index page.
 
     Args:
         request (Request): The FastAPI request object.
 
+    The template only varies with the request base URL (used by url_for), so
+    the rendered page is cached on app.state.index_cache keyed on it.
+
     Returns:
-        TemplateResponse: Rendered index.html template with camera states and settings.
+        HTMLResponse: Rendered index.html template.
     """
-    # pylint: disable=import-outside-toplevel
-    from app import templates
-    camera_state_manager = get_camera_state_manager()
-    camera_uuids = await camera_state_manager.get_all_camera_uuids()
-    if not camera_uuids:
-        logging.warning("No camera UUIDs found, attempting to initialize cameras...")
-        camera_uuids = await camera_state_manager.get_all_camera_uuids()
-    camera_states = {}
-    for cam_uuid in camera_uuids:
-        camera_states[cam_uuid] = await camera_state_manager.get_camera_state(cam_uuid)
-    return templates.TemplateResponse("index.html", {
-        "camera_states": camera_states,
-        "request": request,
-        "current_time": time.time(),
-    })
+    cache_key = str(request.base_url)
+    cached = request.app.state.index_cache
+    if cached is not None and cached[0] == cache_key:
+        return HTMLResponse(content=cached[1])
+    response = get_templates().TemplateResponse("index.html", {"request": request})
+    request.app.state.index_cache = (cache_key, response.body)
+    return response
 
 # pylint: disable=unused-argument
 @router.post("/", include_in_schema=False)
@@ -86,6 +95,12 @@ async def update_settings(request: Request,
     return RedirectResponse("/", status_code=303)
 
 
+def invalidate_feed_settings_cache():
+    """Drop the cached /get-feed-settings response so the next request rebuilds it."""
+    # pylint: disable=global-statement
+    global _cached_settings
+    _cached_settings = None
+
 @router.post("/save-feed-settings", include_in_schema=False)
 async def save_feed_settings(settings: FeedSettings):
     """Save camera feed and detection settings to configuration.
@@ -112,6 +127,7 @@ async def save_feed_settings(settings: FeedSettings):
         }
         update_config(config_data)
         stream_optimizer.invalidate_cache()
+        invalidate_feed_settings_cache()
         logging.debug("Feed settings saved successfully.")
         return {"success": True, "message": "Feed settings saved successfully."}
     except Exception as e:
@@ -132,20 +148,18 @@ async def get_feed_settings():
     Raises:
         HTTPException: If loading settings fails due to configuration errors.
     """
+    # pylint: disable=global-statement
+    global _cached_settings
+    if (_cached_settings is not None and
+            time.monotonic() - _cached_settings[0] < FEED_SETTINGS_CACHE_TTL_S):
+        return _cached_settings[1]
     try:
         config = get_config()
-        # pylint:disable=import-outside-toplevel
-        settings = {
-            "stream_max_fps": config.get(SavedConfig.STREAM_MAX_FPS, STREAM_MAX_FPS),
-            "stream_tunnel_fps": config.get(SavedConfig.STREAM_TUNNEL_FPS, STREAM_TUNNEL_FPS),
-            "stream_jpeg_quality": config.get(SavedConfig.STREAM_JPEG_QUALITY, STREAM_JPEG_QUALITY),
-            "stream_max_width": config.get(SavedConfig.STREAM_MAX_WIDTH, STREAM_MAX_WIDTH),
-            "detection_interval_ms": config.get(SavedConfig.DETECTION_INTERVAL_MS, DETECTION_INTERVAL_MS),
-            "printer_stat_polling_rate_ms": config.get(SavedConfig.PRINTER_STAT_POLLING_RATE_MS, PRINTER_STAT_POLLING_RATE_MS),
-            "min_sse_dispatch_delay_ms": config.get(SavedConfig.MIN_SSE_DISPATCH_DELAY_MS, MIN_SSE_DISPATCH_DELAY_MS)
-        }
+        settings = {name: config.get(key, default) for name, key, default in _SETTINGS_SPEC}
         settings["detections_per_second"] = round(1000 / settings["detection_interval_ms"])
-        return {"success": True, "settings": settings}
+        response = {"success": True, "settings": settings}
+        _cached_settings = (time.monotonic(), response)
+        return response
     except Exception as e:
         logging.error("Error loading feed settings: %s", e)
         raise HTTPException(
@@ -3,7 +3,8 @@ import logging
 from fastapi import APIRouter, Request
 
 from models import SavedConfig, SavedKey
-from utils.config import get_config, get_key, update_config
+from utils.config import get_config, get_key
+from utils.notification_utils import get_subscription_audience, mark_subscriptions_dirty
 
 router = APIRouter()
 
@@ -38,15 +39,12 @@ async def subscribe(request: Request):
         if not subscription.get('endpoint') or not subscription.get('keys'):
             logging.error("Invalid subscription format - missing endpoint or keys")
             return {"success": False, "error": "Invalid subscription format"}
-        for existing_sub in request.app.state.subscriptions:
-            if existing_sub.get('endpoint') == subscription.get('endpoint'):
-                request.app.state.subscriptions.remove(existing_sub)
-                logging.debug("Removed existing subscription for same endpoint")
-                break
-        request.app.state.subscriptions.append(subscription)
-        config = get_config() or {}
-        config[SavedConfig.PUSH_SUBSCRIPTIONS] = request.app.state.subscriptions
-        update_config(config)
+        subscriptions = request.app.state.subscriptions
+        if subscription['endpoint'] in subscriptions:
+            logging.debug("Replacing existing subscription for same endpoint")
+        get_subscription_audience(subscription)
+        subscriptions[subscription['endpoint']] = subscription
+        mark_subscriptions_dirty()
         logging.debug("Successfully added subscription. Total subscriptions: %d", len(request.app.state.subscriptions))
         return {"success": True}
     # pylint: disable=W0718
@@ -65,9 +63,7 @@ async def unsubscribe(request: Request):
         dict: Success status indicating all subscriptions were cleared.
     """
     request.app.state.subscriptions.clear()
-    config = get_config() or {}
-    config[SavedConfig.PUSH_SUBSCRIPTIONS] = []
-    update_config(config)
+    mark_subscriptions_dirty()
     logging.debug("All push subscriptions cleared and persisted.")
     return {"success": True}
 
@@ -87,10 +83,11 @@ async def notification_debug(request: Request):
         "subscriptions_count": len(request.app.state.subscriptions),
         "subscriptions": [
             {
-                "endpoint": sub.get('endpoint', 'unknown')[:50] + "..." if len(sub.get('endpoint', '')) > 50 else sub.get('endpoint', 'unknown'),
+                "endpoint": endpoint[:50] + "..." if len(endpoint) > 50 else endpoint or 'unknown',
                 "has_keys": bool(sub.get('keys'))
             }
-            for sub in request.app.state.subscriptions
+            # Subscriptions are keyed by their endpoint
+            for endpoint, sub in request.app.state.subscriptions.items()
         ],
         "vapid_config": {
             "has_public_key": bool(config.get(SavedConfig.VAPID_PUBLIC_KEY)),
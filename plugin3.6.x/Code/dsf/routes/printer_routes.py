@@ -1,15 +1,19 @@
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 
 from models import PrinterConfigRequest, AlertAction
-from utils.printer_services.octoprint import OctoPrintClient
-from utils.printer_utils import (get_printer_id, remove_printer,
-                                   set_printer, suspend_print_job)
-from utils.camera_utils import get_camera_state
+from utils.printer_utils import (drop_octoprint_client, get_octoprint_client,
+                                   get_printer_config, get_printer_id,
+                                   remove_printer, set_printer, suspend_print_job)
+from utils.camera_utils import get_camera_nickname
 
 router = APIRouter()
 
+_NO_PRINTER_RESPONSE = ORJSONResponse(
+    {"success": False, "error": "No printer configured for this camera"})
+
 @router.post("/printer/add/{camera_uuid}", include_in_schema=False)
 async def add_printer_ep(camera_uuid: str, printer_config: PrinterConfigRequest):
     """Add a printer configuration to a specific camera.
@@ -20,17 +24,17 @@ async def add_printer_ep(camera_uuid: str, printer_config: PrinterConfigRequest)
                                               base URL, API key, and name.
 
     Returns:
-        dict: Success status and generated printer ID, or error details.
+        ORJSONResponse: Success status and generated printer ID.
 
     Raises:
         HTTPException: If printer connection test fails or configuration is invalid.
     """
     try:
-        client = OctoPrintClient(printer_config.base_url, printer_config.api_key)
-        client.get_job_info()
+        client = get_octoprint_client(printer_config.base_url, printer_config.api_key)
+        await client.get_job_info()
         printer_id = f"{camera_uuid}_{printer_config.name.replace(' ', '_')}"
         await set_printer(camera_uuid, printer_id, printer_config.model_dump())
-        return {"success": True, "printer_id": printer_id}
+        return ORJSONResponse({"success": True, "printer_id": printer_id})
     except Exception as e:
         logging.error("Error adding printer: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to add printer: {str(e)}")
@@ -43,7 +47,8 @@ async def remove_printer_ep(camera_uuid: str):
         camera_uuid (str): UUID of the camera to remove printer configuration from.
 
     Returns:
-        dict: Success status and confirmation message, or error if no printer configured.
+        ORJSONResponse: Success status and confirmation message, or error if no
+                        printer configured.
 
     Raises:
         HTTPException: If removal fails due to system errors.
@@ -51,12 +56,15 @@ async def remove_printer_ep(camera_uuid: str):
     try:
         printer_id = get_printer_id(camera_uuid)
         if printer_id:
+            printer_config = get_printer_config(camera_uuid)
             await remove_printer(camera_uuid)
-            camera_state = await get_camera_state(camera_uuid)
-            camera_nickname = camera_state.nickname if camera_state else camera_uuid
-            return {"success": True, "message": f"Printer removed from camera {camera_nickname}"}
-        else:
-            return {"success": False, "error": "No printer configured for this camera"}
+            if printer_config:
+                drop_octoprint_client(printer_config.get('base_url'),
+                                      printer_config.get('api_key'))
+            camera_nickname = get_camera_nickname(camera_uuid)
+            return ORJSONResponse({"success": True,
+                                   "message": f"Printer removed from camera {camera_nickname}"})
+        return _NO_PRINTER_RESPONSE
     except Exception as e:
         logging.error("Error removing printer from camera %s: %s", camera_uuid, e)
         raise HTTPException(status_code=500, detail=f"Failed to remove printer: {str(e)}")
@@ -69,12 +77,10 @@ async def cancel_print_job_ep(camera_uuid: str):
         camera_uuid (str): UUID of the camera whose printer job should be cancelled.
 
     Returns:
-        dict: Success status and confirmation message.
+        Response: Empty 204 response once the cancel request has been issued.
     """
-    suspend_print_job(camera_uuid, AlertAction.CANCEL_PRINT)
-    camera_state = await get_camera_state(camera_uuid)
-    camera_nickname = camera_state.nickname if camera_state else camera_uuid
-    return {"success": True, "message": f"Print job cancelled for camera {camera_nickname}"}
+    await suspend_print_job(camera_uuid, AlertAction.CANCEL_PRINT)
+    return Response(status_code=204)
 
 @router.post("/printer/pause/{camera_uuid}", include_in_schema=False)
 async def pause_print_job_ep(camera_uuid: str):
@@ -84,9 +90,7 @@ async def pause_print_job_ep(camera_uuid: str):
         camera_uuid (str): UUID of the camera whose printer job should be paused.
 
     Returns:
-        dict: Success status and confirmation message.
+        Response: Empty 204 response once the pause request has been issued.
     """
-    suspend_print_job(camera_uuid, AlertAction.PAUSE_PRINT)
-    camera_state = await get_camera_state(camera_uuid)
-    camera_nickname = camera_state.nickname if camera_state else camera_uuid
-    return {"success": True, "message": f"Print job paused for camera {camera_nickname}"}
+    await suspend_print_job(camera_uuid, AlertAction.PAUSE_PRINT)
+    return Response(status_code=204)
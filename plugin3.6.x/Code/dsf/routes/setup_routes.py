@@ -1,23 +1,60 @@
-import base64
+import asyncio
 import logging
+import os
+import threading
 
+import aiofiles
 import trustme
 from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
 from fastapi import APIRouter, Request
 from fastapi.exceptions import HTTPException
 from fastapi.responses import RedirectResponse
-from py_vapid import Vapid
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 from models import (TunnelProvider, TunnelSettings, SavedConfig,
                       VapidSettings, SavedKey, SetupCompletion,
                       CloudflareTunnelConfig, CloudflareDownloadConfig)
 from utils.config import (SSL_CA_FILE, SSL_CERT_FILE,
-                            store_key, get_config, update_config, get_key)
-from utils.setup_utils import setup_ngrok_tunnel
-from utils.cloudflare_utils import CloudflareAPI, get_cloudflare_setup_sequence
+                            store_key, get_config, update_config, get_key,
+                            update_config_and_keys)
+from utils.setup_utils import normalize_domain, setup_ngrok_tunnel
+from utils.cloudflare_utils import get_cloudflare_api, get_cloudflare_setup_sequence
+from utils.notification_utils import invalidate_vapid_cache
+from utils.app_ref import get_templates
 
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+_ca_lock = threading.Lock()
+
+def _load_or_create_ca():
+    """Load the persisted local CA, creating and persisting one on first use.
+
+    Reusing the CA means regenerating the server certificate (e.g. after a
+    domain change) only costs a leaf key, and browsers that already trust
+    the CA keep trusting the new certificate.
+
+    Returns:
+        trustme.CA: The certificate authority used to issue server certificates.
+    """
+    with _ca_lock:
+        ca_private_key = get_key(SavedKey.SSL_CA_PRIVATE_KEY)
+        if ca_private_key and os.path.exists(SSL_CA_FILE):
+            try:
+                with open(SSL_CA_FILE, "rb") as f:
+                    return trustme.CA.from_pem(f.read(), ca_private_key.encode('utf-8'))
+            except (OSError, ValueError) as e:
+                logging.warning("Stored CA could not be loaded, creating a new one: %s", e)
+        ca = trustme.CA(key_type=trustme.KeyType.ECDSA)
+        ca.cert_pem.write_to_path(SSL_CA_FILE)
+        store_key(SavedKey.SSL_CA_PRIVATE_KEY, ca.private_key_pem.bytes().decode('utf-8'))
+        return ca
+
 @router.get("/setup", include_in_schema=False)
 async def serve_setup(request: Request):
     """Serve the setup page for initial application configuration.
@@ -28,8 +65,7 @@ async def serve_setup(request: Request):
     Returns:
         TemplateResponse: Rendered setup.html template for configuration.
     """
-    # pylint:disable=import-outside-toplevel
-    from app import templates
+    templates = get_templates()
     return templates.TemplateResponse("setup.html", {
         "request": request
     })
@@ -45,14 +81,13 @@ async def generate_vapid_keys():
         HTTPException: If key generation fails due to cryptographic errors.
     """
     try:
-        vapid = Vapid()
-        vapid.generate_keys()
-        public_key_raw = vapid.public_key.public_bytes(
+        private_key_obj = ec.generate_private_key(ec.SECP256R1())
+        public_key_raw = private_key_obj.public_key().public_bytes(
             encoding=serialization.Encoding.X962,
             format=serialization.PublicFormat.UncompressedPoint
         )
         public_key = base64.urlsafe_b64encode(public_key_raw).decode('utf-8')
-        private_key_raw = vapid.private_key.private_bytes(
+        private_key_raw = private_key_obj.private_bytes(
             encoding=serialization.Encoding.DER,
             format=serialization.PrivateFormat.PKCS8,
             encryption_algorithm=serialization.NoEncryption()
@@ -85,19 +120,16 @@ async def save_vapid_settings(settings: VapidSettings):
         HTTPException: If saving VAPID settings fails due to validation or storage errors.
     """
     try:
-        domain = settings.base_url
-        if domain.startswith(('http://', 'https://')):
-            domain = domain.split('://')[1]
-        if domain.endswith('/'):
-            domain = domain[:-1]
+        domain = normalize_domain(settings.base_url)
 
         config_data = {
             SavedConfig.VAPID_PUBLIC_KEY: settings.public_key,
             SavedConfig.VAPID_SUBJECT: settings.subject,
             SavedConfig.SITE_DOMAIN: domain
         }
-        store_key(SavedKey.VAPID_PRIVATE_KEY, settings.private_key)
-        update_config(config_data)
+        update_config_and_keys(config_data,
+                               {SavedKey.VAPID_PRIVATE_KEY: settings.private_key})
+        invalidate_vapid_cache()
         return {"success": True}
     except Exception as e:
         logging.error("Error saving VAPID settings: %s", e)
@@ -118,20 +150,16 @@ async def generate_ssl_cert():
     """
     config = get_config()
     try:
-        ca = trustme.CA()
+        ca = await asyncio.to_thread(_load_or_create_ca)
         domain = config.get(SavedConfig.SITE_DOMAIN, None)
         if not domain:
             raise HTTPException(status_code=400, 
                                 detail="Site domain is not set in the configuration.")
-        if domain.startswith(('http://', 'https://')):
-            domain = domain.split('://')[1]
-        if domain.endswith('/'):
-            domain = domain[:-1]
-        server_cert = ca.issue_cert(domain)
-        with open(SSL_CERT_FILE, "wb") as f:
-            f.write(server_cert.cert_chain_pems[0].bytes())
-        with open(SSL_CA_FILE, "wb") as f:
-            f.write(ca.cert_pem.bytes())
+        domain = normalize_domain(domain)
+        server_cert = await asyncio.to_thread(ca.issue_cert, domain,
+                                              key_type=trustme.KeyType.ECDSA)
+        async with aiofiles.open(SSL_CERT_FILE, "wb") as f:
+            await f.write(server_cert.cert_chain_pems[0].bytes())
         store_key(SavedKey.SSL_PRIVATE_KEY, server_cert.private_key_pem.bytes().decode('utf-8'))
         logging.debug("SSL certificate and key generated successfully.")
         return {"success": True, "message": "SSL certificate and key saved."}
@@ -158,9 +186,9 @@ async def upload_ssl_cert(request: Request):
     if not cert_file or not key_file:
         raise HTTPException(status_code=400, detail="Both certificate and key files are required")
     try:
-        cert_content = await cert_file.read()
-        with open(SSL_CERT_FILE, "wb") as f:
-            f.write(cert_content)
+        async with aiofiles.open(SSL_CERT_FILE, "wb") as f:
+            while chunk := await cert_file.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
         key_content = await key_file.read()
         store_key(SavedKey.SSL_PRIVATE_KEY, key_content.decode('utf-8'))
         logging.debug("SSL certificate and key uploaded successfully.")
@@ -189,8 +217,7 @@ async def save_tunnel_settings(settings: TunnelSettings):
         }
         if settings.email:
             config_data[SavedConfig.CLOUDFLARE_EMAIL] = settings.email
-        store_key(SavedKey.TUNNEL_API_KEY, settings.token)
-        update_config(config_data)
+        update_config_and_keys(config_data, {SavedKey.TUNNEL_API_KEY: settings.token})
         logging.debug("Tunnel settings saved successfully.")
         return {"success": True, "message": "Tunnel settings saved successfully."}
     except Exception as e:
@@ -272,10 +299,12 @@ async def get_cloudflare_accounts_zones():
                 status_code=400,
                 detail="Cloudflare API token not found. Please configure tunnel settings first."
             )
-        cf = CloudflareAPI(api_token, email)
-        accounts_response = cf.get_accounts()
+        cf = get_cloudflare_api(api_token, email)
+        accounts_response, zones_response = await asyncio.gather(
+            asyncio.to_thread(cf.get_accounts),
+            asyncio.to_thread(cf.get_zones)
+        )
         accounts = accounts_response.get("result", [])
-        zones_response = cf.get_zones()
         zones = zones_response.get("result", [])
         return {
             "success": True,
@@ -314,16 +343,22 @@ async def create_cloudflare_tunnel(config: CloudflareTunnelConfig):
                 status_code=400,
                 detail="Cloudflare API token not found"
             )
-        cf = CloudflareAPI(api_token, email)
+        cf = get_cloudflare_api(api_token, email)
         tunnel_name = config.subdomain
-        tunnel_response = cf.create_tunnel(config.account_id, tunnel_name)
+        if config.zone_id in cf.zones_by_id:
+            tunnel_response = await asyncio.to_thread(cf.create_tunnel,
+                                                      config.account_id, tunnel_name)
+        else:
+            tunnel_response, _ = await asyncio.gather(
+                asyncio.to_thread(cf.create_tunnel, config.account_id, tunnel_name),
+                asyncio.to_thread(cf.get_zones)
+            )
         tunnel_id = tunnel_response["result"]["id"]
         tunnel_token = tunnel_response["result"]["token"]
-        zones_response = cf.get_zones()
-        zone_name = next((z["name"] for z in zones_response["result"] if (
-            z["id"] == config.zone_id)), "")
+        zone_name = cf.zones_by_id.get(config.zone_id, {}).get("name", "")
         tunnel_url = f"{config.subdomain}.{zone_name}"
-        _ = cf.create_dns_record(config.zone_id, tunnel_id, config.subdomain)
+        _ = await asyncio.to_thread(cf.create_dns_record, config.zone_id,
+                                    tunnel_id, config.subdomain)
         store_key(SavedKey.TUNNEL_TOKEN, tunnel_token)
         return {
             "success": True,
@@ -402,8 +437,7 @@ async def serve_cloudflare_add_device(request: Request):
         HTTPException: If tunnel configuration is incomplete or template rendering fails.
     """
     try:
-        # pylint:disable=import-outside-toplevel
-        from app import templates
+        templates = get_templates()
         config = get_config()
         site_domain = config.get(SavedConfig.SITE_DOMAIN, "")
         return templates.TemplateResponse("warp_device_enrollment.html", {
@@ -446,8 +480,8 @@ async def get_cloudflare_organisation(request: Request):
                 status_code=400,
                 detail="Cloudflare API token not found. Please complete tunnel setup first."
             )
-        cf = CloudflareAPI(api_token, email)
-        accounts_response = cf.get_accounts()
+        cf = get_cloudflare_api(api_token, email)
+        accounts_response = await asyncio.to_thread(cf.get_accounts)
         accounts = accounts_response.get("result", [])
         if not accounts:
             raise HTTPException(
@@ -456,7 +490,7 @@ async def get_cloudflare_organisation(request: Request):
             )
         account_id = accounts[0]["id"]
         try:
-            org_response = cf.get_organization(account_id)
+            org_response = await asyncio.to_thread(cf.get_organization, account_id)
             org_result = org_response.get("result")
             if org_result:
                 team_name = org_result.get("name", "your-organization")
@@ -4,6 +4,7 @@ import logging
 import os
 import sys
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 import torch
@@ -19,6 +20,82 @@ try:
 except ImportError:
     pass
 
+try:
+    import onnx
+except ImportError:
+    onnx = None
+
+ONNX_OPSET_VERSION = 17
+
+
+def optimize_onnx_model(onnx_path: str) -> Optional[str]:
+    """Run shape inference and ONNX Runtime graph optimizations on an exported model.
+
+    Shape inference is applied to the exported file in place. The graph is
+    then optimized with ONNX Runtime's extended (fusion) level and saved next
+    to it. Both steps are best-effort: a failure is logged and the plain
+    export is left usable.
+
+    Args:
+        onnx_path: Path to the exported ONNX model
+
+    Returns:
+        Path of the optimized model, or None if optimization failed
+    """
+    if onnx is not None:
+        try:
+            onnx.shape_inference.infer_shapes_path(onnx_path, onnx_path)
+            logging.info("Shape inference applied to %s", onnx_path)
+        except Exception as e:
+            logging.warning("Shape inference failed, continuing without it: %s", e)
+    else:
+        logging.warning("onnx package not available. Skipping shape inference.")
+    optimized_path = str(Path(onnx_path).with_suffix('.opt.onnx'))
+    try:
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        session_options.optimized_model_filepath = optimized_path
+        ort.InferenceSession(onnx_path, session_options, providers=["CPUExecutionProvider"])
+    except Exception as e:
+        logging.warning("Graph optimization failed, keeping the unoptimized model: %s", e)
+        return None
+    logging.info("Optimized ONNX model saved to %s", optimized_path)
+    return optimized_path
+
+
+def quantize_onnx_model(onnx_path: str, mode: str) -> Optional[str]:
+    """Write a reduced-precision copy of an exported ONNX model.
+
+    ``int8`` applies ONNX Runtime dynamic quantization to the weights, which
+    suits CPU inference. ``fp16`` converts the graph to half precision for
+    CUDA/MPS deployment. The FP32 model is left in place.
+
+    Args:
+        onnx_path: Path to the exported FP32 ONNX model
+        mode: Quantization mode ('none', 'int8' or 'fp16')
+
+    Returns:
+        Path of the quantized model, or None if no quantization was done
+    """
+    if mode == "none":
+        return None
+    quantized_path = str(Path(onnx_path).with_suffix(f'.{mode}.onnx'))
+    if mode == "int8":
+        # pylint: disable=import-outside-toplevel
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QInt8)
+    elif mode == "fp16":
+        if onnx is None:
+            raise ImportError("onnx package is required for fp16 conversion")
+        # pylint: disable=import-outside-toplevel
+        from onnxconverter_common import float16
+        model_fp16 = float16.convert_float_to_float16(onnx.load(onnx_path))
+        onnx.save(model_fp16, quantized_path)
+    else:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+    logging.info("%s model saved to %s", mode.upper(), quantized_path)
+    return quantized_path
+
 
 def get_available_devices():
     """Get list of available devices for model conversion."""
@@ -46,7 +123,8 @@ def validate_device(device: str):
 
 
 def convert_pytorch_to_onnx(pytorch_model_path: str, options_path: str,
-                           output_path: str, device: str = "cpu"):
+                           output_path: str, device: str = "cpu",
+                           quantize: str = "none"):
     """Convert a PyTorch model to ONNX format.
     
     Args:
@@ -54,6 +132,7 @@ def convert_pytorch_to_onnx(pytorch_model_path: str, options_path: str,
         options_path: Path to the model options JSON file
         output_path: Path where the ONNX model will be saved
         device: Device to use for conversion ('cpu', 'cuda', or 'mps')
+        quantize: Post-export quantization ('none', 'int8' or 'fp16')
     """
     device = validate_device(device)
     try:
@@ -89,7 +168,7 @@ def convert_pytorch_to_onnx(pytorch_model_path: str, options_path: str,
                 "input": {0: "batch_size"},
                 "output": {0: "batch_size"}
             },
-            "opset_version": 11,
+            "opset_version": ONNX_OPSET_VERSION,
             "do_constant_folding": True,
             "export_params": True,
         }
@@ -101,6 +180,7 @@ def convert_pytorch_to_onnx(pytorch_model_path: str, options_path: str,
             **export_params
         )
         logging.info("ONNX model saved to %s", output_path)
+        optimize_onnx_model(output_path)
         try:
             logging.info("Verifying ONNX model...")
             session = ort.InferenceSession(output_path)
@@ -110,7 +190,10 @@ def convert_pytorch_to_onnx(pytorch_model_path: str, options_path: str,
             logging.info("Output shape: %s", output[0].shape)
             pytorch_output = test_output.detach().cpu().numpy()
             onnx_output = output[0]
-            max_diff = np.max(np.abs(pytorch_output - onnx_output))
+            # One output-sized buffer: subtract into it, then take abs in place
+            diff = np.subtract(pytorch_output, onnx_output, dtype=np.float32)
+            np.abs(diff, out=diff)
+            max_diff = float(diff.max())
             logging.info("Maximum difference between PyTorch and ONNX outputs: %.6f", max_diff)
             if max_diff < 1e-5:
                 logging.info("PyTorch and ONNX outputs are very close (diff < 1e-5)")
@@ -124,6 +207,7 @@ def convert_pytorch_to_onnx(pytorch_model_path: str, options_path: str,
         except Exception as e:
             logging.error("ONNX model verification failed: %s", e)
             raise
+        quantize_onnx_model(output_path, quantize)
     except Exception as e:
         logging.error("Failed to convert model: %s", e)
         raise
@@ -161,6 +245,12 @@ def main():
         default="cpu",
         help="Device to use for conversion. 'cpu' is always available, 'cuda' requires NVIDIA GPU, 'mps' requires Apple Silicon Mac with macOS 12.3+"
     )
+    parser.add_argument(
+        "-q", "--quantize",
+        choices=["none", "int8", "fp16"],
+        default="none",
+        help="Also write a quantized copy of the model: 'int8' (dynamic, for CPU) or 'fp16' (for CUDA/MPS, requires onnxconverter-common)"
+    )
     parser.add_argument(
         "-v", "--verbose", 
         action="store_true",
@@ -188,7 +278,8 @@ def main():
             args.pytorch_model,
             args.options_file,
             output_path,
-            args.device
+            args.device,
+            args.quantize
         )
         logging.info("Conversion completed successfully!")
     except Exception as e:
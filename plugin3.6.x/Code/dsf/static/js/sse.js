@@ -113,8 +113,8 @@ function updateAlertUI(data) {
     let alertContent = `<p>${data.message}</p>`;
     alertContent += `<p id="countdown-${data.id}"></p>`;
 
-    if (data.snapshot) {
-        alertContent = `<img src="data:image/jpeg;base64,${data.snapshot}" 
+    if (data.snapshot_url) {
+        alertContent = `<img src="${data.snapshot_url}" 
                             style="width:100%;margin-bottom:10px;" />` + alertContent;
     }
     const hasPrinter = data.has_printer === true;
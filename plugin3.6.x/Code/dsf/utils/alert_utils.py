@@ -1,13 +1,20 @@
-import base64
+import asyncio
 import io
-import json
 
+import orjson
 from PIL import Image
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 from utils.camera_utils import update_camera_state
+from utils.sse_utils import has_alert_subscribers, publish_alert_event
+from utils.app_ref import get_app
 
+JPEG_SOI = b"\xff\xd8"
 
-def append_new_alert(alert):
+async def append_new_alert(alert):
     """Appends a new alert to the application's state.
 
     Args:
@@ -25,9 +32,11 @@ def append_new_alert(alert):
                 "countdown_action": str
             }
     """
-    # pylint: disable=import-outside-toplevel
-    from app import app
+    app = get_app()
     app.state.alerts[alert.id] = alert
+    app.state.active_alerts_cache = None
+    if has_alert_subscribers():
+        publish_alert_event({"type": "added", "alert": alert_to_response_dict(alert)})
 
 def get_alert(alert_id):
     """Retrieves a single alert by its ID from the application's state.
@@ -38,8 +47,7 @@ def get_alert(alert_id):
     Returns:
         Alert: The alert object if found, otherwise None.
     """
-    # pylint: disable=import-outside-toplevel
-    from app import app
+    app = get_app()
     alert = app.state.alerts.get(alert_id, None)
     return alert
 
@@ -52,44 +60,113 @@ async def dismiss_alert(alert_id):
     Returns:
         bool: True if the alert was successfully dismissed, False otherwise.
     """
-    # pylint: disable=import-outside-toplevel
-    from app import app
+    app = get_app()
     if alert_id in app.state.alerts:
         del app.state.alerts[alert_id]
+        app.state.active_alerts_cache = None
+        publish_alert_event({"type": "dismissed", "id": alert_id})
         camera_uuid = alert_id.split('_')[0]
         await update_camera_state(camera_uuid, {"current_alert_id": None})
         return True
     return False
 
-def alert_to_response_json(alert):
-    """Converts an Alert object to a JSON string for API responses.
+def get_active_alerts_json():
+    """Returns the serialized active alerts, rebuilding them only after a change.
+
+    The encoded payload is cached on app.state.active_alerts_cache and cleared
+    whenever an alert is added or dismissed.
+
+    Returns:
+        bytes: JSON encoded {"active_alerts": [...]} payload.
+    """
+    app = get_app()
+    cached = app.state.active_alerts_cache
+    if cached is None:
+        cached = orjson.dumps({"active_alerts": [
+            alert_to_response_dict(alert) for alert in app.state.alerts.values()
+        ]})
+        app.state.active_alerts_cache = cached
+    return cached
+
+def _reencode_jpeg(img_bytes):
+    """Re-encodes an image as JPEG with PIL.
+
+    Args:
+        img_bytes (bytes): The source image in any format PIL can read.
+
+    Returns:
+        bytes: The JPEG data.
+    """
+    buffer = io.BytesIO()
+    Image.open(io.BytesIO(img_bytes)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+async def get_alert_snapshot(alert_id):
+    """Returns an alert's snapshot as JPEG bytes.
+
+    Snapshots that are already JPEG are returned as-is; anything else is
+    converted with PIL in a worker thread so the event loop is not blocked.
+
+    Args:
+        alert_id (str): The ID of the alert.
+
+    Returns:
+        bytes | None: The JPEG image, or None if the alert does not exist.
+    """
+    alert = get_alert(alert_id)
+    if alert is None:
+        return None
+    img_bytes = alert.snapshot
+    if isinstance(img_bytes, str):
+        img_bytes = base64.b64decode(img_bytes)
+    if img_bytes[:2] != JPEG_SOI:
+        img_bytes = await asyncio.to_thread(_reencode_jpeg, img_bytes)
+    return img_bytes
 
-    The snapshot image is base64 encoded within the JSON.
+def _snapshot_url(alert):
+    """Returns the URL the alert's snapshot is served from."""
+    return f"/alert/{alert.id}/snapshot"
+
+def alert_to_response_dict(alert):
+    """Converts an Alert object to a dictionary for API responses.
+
+    The snapshot is excluded from the model's serialization and referenced
+    by URL instead, so alert payloads stay small.
 
     Args:
         alert (Alert): The alert object to convert.
 
     Returns:
-        str: A JSON string representing the alert.
+        dict: A dictionary representing the alert.
             The structure is:
             {
                 "id": str,
-                "snapshot": str (base64 encoded image),
                 "title": str,
                 "message": str,
                 "timestamp": float,
                 "countdown_time": float,
                 "camera_uuid": str,
                 "has_printer": bool,
-                "countdown_action": str
+                "countdown_action": str,
+                "snapshot_url": str
             }
     """
-    img_bytes = alert.snapshot
-    if isinstance(img_bytes, str):
-        img_bytes = base64.b64decode(img_bytes)
-    buffer = io.BytesIO()
-    Image.open(io.BytesIO(img_bytes)).save(buffer, format="JPEG")
-    base64_snapshot = base64.b64encode(buffer.getvalue()).decode("utf-8")
     alert_dict = alert.model_dump()
-    alert_dict['snapshot'] = base64_snapshot
-    return json.dumps(alert_dict)
+    alert_dict['snapshot_url'] = _snapshot_url(alert)
+    return alert_dict
+
+def alert_to_response_json(alert):
+    """Converts an Alert object to a JSON string for API responses.
+
+    The alert fields are serialized by Pydantic and the encoded snapshot URL
+    is appended to the object.
+
+    Args:
+        alert (Alert): The alert object to convert.
+
+    Returns:
+        str: A JSON string with the structure of alert_to_response_dict.
+    """
+    alert_json = alert.model_dump_json()
+    snapshot_url = orjson.dumps(_snapshot_url(alert)).decode("utf-8")
+    return f'{alert_json[:-1]},"snapshot_url":{snapshot_url}}}'
@@ -0,0 +1,28 @@
+import functools
+
+
+@functools.cache
+def get_app():
+    """Get the FastAPI application instance.
+
+    The import is deferred to the first call to avoid a circular import
+    between app.py and the modules it loads, then memoized.
+
+    Returns:
+        FastAPI: The application instance.
+    """
+    # pylint: disable=import-outside-toplevel
+    from app import app
+    return app
+
+
+@functools.cache
+def get_templates():
+    """Get the Jinja2 templates used to render the web UI.
+
+    Returns:
+        Jinja2Templates: The application's template renderer.
+    """
+    # pylint: disable=import-outside-toplevel
+    from app import templates
+    return templates
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import weakref
 from typing import Dict, Optional
 from pydantic import ValidationError
 from models import CameraState
@@ -11,22 +12,25 @@ class CameraStateManager:
     def __init__(self):
         """Initializes the CameraStateManager, loading states from the configuration."""
         self._states: Dict[str, CameraState] = {}
-        self._lock: Optional[asyncio.Lock] = None
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._unsaved_detections = 0
         self._load_states_from_config()
 
     @property
     def lock(self) -> asyncio.Lock:
         """Provides a lock for thread-safe operations on camera states.
 
+        Each event loop (the main loop and the background loop used by
+        synchronous callers) keeps its own lock for as long as it exists.
+
         Returns:
             asyncio.Lock: The lock instance for the current event loop.
         """
         loop = asyncio.get_running_loop()
-        if self._lock is None or self._loop is not loop:
-            self._lock = asyncio.Lock()
-            self._loop = loop
-        return self._lock
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
 
     def _load_states_from_config(self):
         """Loads camera states from the application's configuration file."""
@@ -121,10 +125,10 @@ class CameraStateManager:
             camera_state_ref = self._states.get(camera_uuid)
             if camera_state_ref:
                 camera_state_ref.detection_history.append((time_val, pred))
-                max_history = 10000
-                if len(camera_state_ref.detection_history) > max_history:
-                    camera_state_ref.detection_history = camera_state_ref.detection_history[-max_history:]
-                if len(camera_state_ref.detection_history) % 100 == 0:
+                # The history is bounded, so count appends rather than its length
+                self._unsaved_detections += 1
+                if self._unsaved_detections >= 100:
+                    self._unsaved_detections = 0
                     self._save_states_to_config()
                 return camera_state_ref
         return None
@@ -138,6 +142,27 @@ class CameraStateManager:
         async with self.lock:
             return list(self._states.keys())
 
+    def get_camera_nickname(self, camera_uuid: str) -> Optional[str]:
+        """Looks up a camera's nickname without creating or locking its state.
+
+        Args:
+            camera_uuid (str): The UUID of the camera.
+
+        Returns:
+            Optional[str]: The nickname, or None if the camera is unknown.
+        """
+        camera_state_ref = self._states.get(camera_uuid)
+        return camera_state_ref.nickname if camera_state_ref else None
+
+    async def get_all_camera_states(self) -> Dict[str, CameraState]:
+        """Retrieves the states of all cameras in a single locked pass.
+
+        Returns:
+            Dict[str, CameraState]: A mapping of camera UUIDs to their states.
+        """
+        async with self.lock:
+            return dict(self._states)
+
     async def remove_camera(self, camera_uuid: str) -> bool:
         """
         Removes a camera and its state.
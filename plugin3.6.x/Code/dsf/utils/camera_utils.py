@@ -1,6 +1,8 @@
 import asyncio
 import concurrent.futures
 import logging
+import threading
+import time
 import uuid
 import sys
 import glob
@@ -10,6 +12,12 @@ import cv2
 from models import CameraState
 from utils.camera_state_manager import get_camera_state_manager
 
+SERIAL_CAMERA_CACHE_TTL_S = 30.0
+MAX_PROBED_CAMERA_INDICES = 10
+
+_serial_camera_cache = None
+_bg_loop = asyncio.new_event_loop()
+threading.Thread(target=_bg_loop.run_forever, name="camera-state-loop", daemon=True).start()
 
 async def add_camera(source, nickname):
     """
@@ -23,7 +31,7 @@ async def add_camera(source, nickname):
         dict: A dictionary containing the new camera's UUID, nickname, and source.
     """
     manager = get_camera_state_manager()
-    camera_uuid = str(uuid.uuid4())
+    camera_uuid = uuid.uuid4().hex
     new_camera_state = CameraState(
         nickname=nickname,
         source=source,
@@ -44,16 +52,42 @@ async def remove_camera(camera_uuid: str) -> bool:
     manager = get_camera_state_manager()
     return await manager.remove_camera(camera_uuid)
 
+def invalidate_serial_camera_cache():
+    """Forget cached camera devices so the next lookup probes again."""
+    # pylint: disable=global-statement
+    global _serial_camera_cache
+    _serial_camera_cache = None
+
 def find_available_serial_cameras() -> list[str]:
     """
     Finds all available camera devices and returns their paths or indices.
 
+    Results are cached for SERIAL_CAMERA_CACHE_TTL_S seconds, because probing
+    devices can take seconds on some platforms. Call
+    invalidate_serial_camera_cache() to force a re-scan.
+
+    Returns:
+        list[str]: A list of device paths or camera indices.
+    """
+    # pylint: disable=global-statement
+    global _serial_camera_cache
+    if (_serial_camera_cache is not None and
+            time.monotonic() - _serial_camera_cache[0] < SERIAL_CAMERA_CACHE_TTL_S):
+        return list(_serial_camera_cache[1])
+    devices = _enumerate_serial_cameras()
+    _serial_camera_cache = (time.monotonic(), devices)
+    return list(devices)
+
+def _enumerate_serial_cameras() -> list[str]:
+    """
+    Probes the system for camera devices.
+
     This function is designed to be cross-platform and works on Linux, macOS,
     Windows, and within Docker containers where devices are correctly mapped.
 
     On Linux, it first attempts to find device paths like '/dev/video*'.
-    If that fails or on other platforms (macOS, Windows), it probes for
-    camera indices by trying to open them sequentially.
+    If that fails or on other platforms (macOS, Windows), it probes camera
+    indices 0-9 concurrently, so gaps in the numbering do not hide devices.
 
     Returns:
         list[str]: A list of strings, where each string is either a device
@@ -72,20 +106,42 @@ def find_available_serial_cameras() -> list[str]:
     api_preference = cv2.CAP_ANY
     if sys.platform == "win32":
         api_preference = cv2.CAP_DSHOW
-    available_indices = []
-    index = 0
-    while len(available_indices) < 10:
+
+    def _probe(index):
         cap = cv2.VideoCapture(index, api_preference)
-        if cap.isOpened():
-            logging.debug("INFO: Camera found at index: %s", index)
-            available_indices.append(str(index))
-            cap.release()
-        else:
+        try:
+            if cap.isOpened():
+                logging.debug("INFO: Camera found at index: %s", index)
+                return str(index)
             logging.debug("INFO: No camera found at index: %s", index)
+            return None
+        finally:
             cap.release()
-            break
-        index += 1
-    return available_indices
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PROBED_CAMERA_INDICES) as executor:
+        results = list(executor.map(_probe, range(MAX_PROBED_CAMERA_INDICES)))
+    return [index for index in results if index is not None]
+
+def get_capture_backend(source) -> int:
+    """
+    Pick the OpenCV capture backend for a camera source.
+
+    Local devices use the platform's native backend so OpenCV does not have to
+    probe every backend on open; network streams keep automatic selection.
+
+    Args:
+        source (int | str): A camera index, device path, or stream URL.
+
+    Returns:
+        int: The cv2.CAP_* backend identifier.
+    """
+    is_device = isinstance(source, int) or (
+        isinstance(source, str) and source.startswith('/dev/'))
+    if is_device and sys.platform.startswith('linux'):
+        return cv2.CAP_V4L2
+    if isinstance(source, int) and sys.platform == "win32":
+        return cv2.CAP_DSHOW
+    return cv2.CAP_ANY
 
 def open_camera(camera_uuid) -> cv2.VideoCapture:
     """
@@ -105,17 +161,14 @@ def open_camera(camera_uuid) -> cv2.VideoCapture:
     if isinstance(source, str) and source.isdigit():
         source = int(source)
 
-    """SRS"""
-    source = 'http://localhost:8090/stream'
-    """/SRS"""
-
-    cap = cv2.VideoCapture(source, cv2.CAP_ANY)
+    cap = cv2.VideoCapture(source, get_capture_backend(source))
     if not cap.isOpened():
         raise RuntimeError(f"Failed to open camera with UUID {camera_uuid}")
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     return cap
 
 async def get_camera_state(camera_uuid, reset=False):
-    """Get this camera's state, handling async context appropriately.
+    """Get this camera's state.
 
     Args:
         camera_uuid (str): The UUID of the camera.
@@ -126,16 +179,17 @@ async def get_camera_state(camera_uuid, reset=False):
     """
     manager = get_camera_state_manager()
     try:
-        def sync_get_state():
-            return asyncio.run(manager.get_camera_state(camera_uuid, reset))
-        return await asyncio.to_thread(sync_get_state)
+        return await manager.get_camera_state(camera_uuid, reset)
     except Exception as e:
-        logging.error("Error in camera state access for camera %d: %s", camera_uuid, e)
+        logging.error("Error in camera state access for camera %s: %s", camera_uuid, e)
         return CameraState()
 
 def get_camera_state_sync(camera_uuid, reset=False):
     """Synchronous wrapper for get_camera_state for contexts that cannot use async/await.
 
+    The lookup runs on a long-lived background event loop, so it works both from
+    plain threads and from synchronous code called inside the main event loop.
+
     Args:
         camera_uuid (str): The UUID of the camera.
         reset (bool): If True, resets the camera state to its default.
@@ -143,20 +197,27 @@ def get_camera_state_sync(camera_uuid, reset=False):
     Returns:
         CameraState: The state of the camera.
     """
+    manager = get_camera_state_manager()
     try:
-        try:
-            asyncio.get_running_loop()
-            def run_in_new_loop():
-                return asyncio.run(get_camera_state(camera_uuid, reset))
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(run_in_new_loop)
-                return future.result(timeout=5.0)
-        except RuntimeError:
-            return asyncio.run(get_camera_state(camera_uuid, reset))
+        future = asyncio.run_coroutine_threadsafe(
+            manager.get_camera_state(camera_uuid, reset), _bg_loop)
+        return future.result(timeout=5.0)
     except Exception as e:
-        logging.error("Error in synchronous camera state access for camera %d: %s", camera_uuid, e)
+        logging.error("Error in synchronous camera state access for camera %s: %s", camera_uuid, e)
         return CameraState()
 
+def get_camera_nickname(camera_uuid):
+    """Get a camera's display name, falling back to its UUID.
+
+    Args:
+        camera_uuid (str): The UUID of the camera.
+
+    Returns:
+        str: The camera nickname, or the UUID if the camera has none.
+    """
+    manager = get_camera_state_manager()
+    return manager.get_camera_nickname(camera_uuid) or camera_uuid
+
 async def update_camera_detection_history(camera_uuid, pred, time_val):
     """Append a detection to the camera's detection history.
 
@@ -1,8 +1,9 @@
 import logging
 import subprocess
+import threading
 from typing import Any, Dict, List, Optional
 
-import requests
+import httpx
 
 from models import OperatingSystem, SavedConfig, SavedKey
 from utils.config import get_config
@@ -13,6 +14,9 @@ class CloudflareAPI:
     
     All responses follow the standard Cloudflare API format with 'result', 'success', 
     'errors', 'messages', and optionally 'result_info' fields.
+
+    Requests go through a pooled httpx.Client so repeated calls reuse the
+    same TLS connection; use get_cloudflare_api() to share one instance.
     """
 
     def __init__(self, api_token: str, email: Optional[str] = None):
@@ -36,6 +40,18 @@ class CloudflareAPI:
                 "Authorization": f"Bearer {api_token}",
                 "Content-Type": "application/json"
             }
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=30,
+            limits=httpx.Limits(keepalive_expiry=60)
+        )
+        self.zones_by_id: Dict[str, Dict[str, Any]] = {}
+        self._zones_lock = threading.Lock()
+
+    def close(self):
+        """Close the underlying HTTP connection pool."""
+        self._client.close()
 
     def _request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make an authenticated request to the Cloudflare API.
@@ -48,8 +64,7 @@ class CloudflareAPI:
         Returns:
             Dict[str, Any]: Parsed JSON response from the API.
         """
-        url = f"{self.base_url}{endpoint}"
-        response = requests.request(method, url, headers=self.headers, json=data, timeout=30)
+        response = self._client.request(method, endpoint, json=data)
         response.raise_for_status()
         return response.json()
 
@@ -66,6 +81,8 @@ class CloudflareAPI:
     def get_zones(self, per_page: int = 50) -> Dict[str, Any]:
         """Retrieve DNS zones for the account.
 
+        The zones are also indexed by ID in ``zones_by_id`` for later lookups.
+
         API Documentation: https://developers.cloudflare.com/api/resources/zones/methods/list/
         
         Args:
@@ -74,7 +91,11 @@ class CloudflareAPI:
         Returns:
             Dict[str, Any]: API response containing zone information.
         """
-        return self._request("GET", f"/zones?per_page={per_page}")
+        response = self._request("GET", f"/zones?per_page={per_page}")
+        zones_by_id = {zone["id"]: zone for zone in response.get("result", [])}
+        with self._zones_lock:
+            self.zones_by_id = zones_by_id
+        return response
 
     def get_organization(self, account_id: str) -> Dict[str, Any]:
         """Retrieve organization information for an account.
@@ -128,6 +149,29 @@ class CloudflareAPI:
         }
         return self._request("POST", f"/zones/{zone_id}/dns_records", data)
 
+_cloudflare_api = None
+_cloudflare_api_lock = threading.Lock()
+
+def get_cloudflare_api(api_token: str, email: Optional[str] = None) -> CloudflareAPI:
+    """Get the shared Cloudflare API client, rebuilding it if the credentials changed.
+
+    A replaced client is not closed, as worker threads may still be using it;
+    its connection pool is released once the last reference is dropped.
+
+    Args:
+        api_token (str): The API token or key for authentication.
+        email (Optional[str]): Email address for legacy authentication.
+
+    Returns:
+        CloudflareAPI: The shared client instance.
+    """
+    global _cloudflare_api  # pylint: disable=global-statement
+    with _cloudflare_api_lock:
+        if (_cloudflare_api is None or _cloudflare_api.api_token != api_token
+                or _cloudflare_api.email != email):
+            _cloudflare_api = CloudflareAPI(api_token, email)
+        return _cloudflare_api
+
 class CloudflareOSCommands:
     """Static methods for generating OS-specific cloudflared commands."""
 
@@ -359,7 +403,7 @@ def setup_tunnel(api_token: str, account_id: str, zone_id: str,
                 }
             }
     """
-    cf = CloudflareAPI(api_token, email)
+    cf = get_cloudflare_api(api_token, email)
     tunnel_response = cf.create_tunnel(account_id, tunnel_name)
     tunnel_id = tunnel_response["result"]["id"]
     tunnel_token = tunnel_response["result"]["token"]
@@ -1,22 +1,29 @@
 from duet import duet
-import json
 import logging
+import mmap
 import os
 import tempfile
 import fcntl
+import functools
+import hashlib
 import threading
 import base64
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 import keyring
 import keyring.errors
-import torch
+import orjson
 from platformdirs import user_data_dir
 
 from utils.model_downloader import get_model_downloader
-from models import AlertAction, SavedKey, SavedConfig
+from models import SavedKey, SavedConfig
+# pylint: disable=unused-import
+from utils.defaults import (BRIGHTNESS, CONTRAST, FOCUS, SENSITIVITY,
+							COUNTDOWN_TIME, COUNTDOWN_ACTION,
+							DETECTION_VOTING_THRESHOLD, DETECTION_VOTING_WINDOW,
+							MAX_CAMERA_HISTORY)
 
 # Config version - increment this when the config structure changes
 CONFIG_VERSION = "1.0.0"
@@ -40,27 +47,36 @@ KEYRING_SERVICE_NAME = "printguard"
 os.makedirs(APP_DATA_DIR, exist_ok=True)
 CONFIG_FILE = os.path.join(APP_DATA_DIR, "config.json")
 SECRETS_FILE = os.path.join(APP_DATA_DIR, "secrets.json")
+SUBSCRIPTIONS_FILE = os.path.join(APP_DATA_DIR, "subscriptions.json")
 LOCK_FILE = os.path.join(APP_DATA_DIR, "config.lock")
 SSL_CERT_FILE = os.path.join(APP_DATA_DIR, "cert.pem")
 SSL_CA_FILE = os.path.join(APP_DATA_DIR, "ca.pem")
+SECRETS_NONCE_SIZE = 12
+CONFIG_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
 
 _config_lock = threading.RLock()
-_file_lock = None
+# Opened once; flock is taken and dropped on this descriptor for each access.
+_file_lock = open(LOCK_FILE, 'a+', encoding='utf-8')  # pylint: disable=consider-using-with
+_lock_depth = 0
+_config_cache = None
+_config_seq = 0
 
 def acquire_lock():
 	"""Acquire a thread and file lock for safe configuration file access.
 
 	Ensures exclusive access to the config file by acquiring a threading lock
-	and a file-based lock at `LOCK_FILE`.
+	and a file-based lock at `LOCK_FILE`. The lock is re-entrant within a
+	thread; the file lock is only taken by the outermost acquisition.
 	"""
 	# pylint: disable=global-statement
-	global _file_lock
+	global _lock_depth
 	_config_lock.acquire()
-	_file_lock = open(LOCK_FILE, 'w')
-	try:
-		fcntl.flock(_file_lock, fcntl.LOCK_EX)
-	except IOError as e:
-		logging.warning("Failed to acquire file lock: %s", e)
+	_lock_depth += 1
+	if _lock_depth == 1:
+		try:
+			fcntl.flock(_file_lock, fcntl.LOCK_EX)
+		except IOError as e:
+			logging.warning("Failed to acquire file lock: %s", e)
 
 
 def release_lock():
@@ -69,13 +85,61 @@ def release_lock():
 	Releases both the file-based lock and the threading lock.
 	"""
 	# pylint: disable=global-statement
-	global _file_lock
-	if _file_lock:
+	global _lock_depth
+	_lock_depth -= 1
+	if _lock_depth == 0:
 		fcntl.flock(_file_lock, fcntl.LOCK_UN)
-		_file_lock.close()
-		_file_lock = None
 	_config_lock.release()
 
+def _atomic_write(path, data, mode=None):
+	"""Replace a file's contents atomically.
+
+	The data is written straight to the descriptor of a temporary file in the
+	same directory (normally a single write call), fsynced, and then renamed
+	over `path`. Readers see either the old or the new contents, never a
+	truncated file.
+
+	Args:
+		path (str): The file to replace.
+		data (bytes): The new contents.
+		mode (int, optional): Permission bits to apply before the rename.
+	"""
+	fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+									prefix=os.path.basename(path) + ".",
+									suffix=".tmp")
+	try:
+		try:
+			view = memoryview(data)
+			while view:
+				view = view[os.write(fd, view):]
+			os.fsync(fd)
+			if mode is not None:
+				os.fchmod(fd, mode)
+		finally:
+			os.close(fd)
+		os.replace(tmp_path, path)
+	except BaseException:
+		if os.path.exists(tmp_path):
+			os.unlink(tmp_path)
+		raise
+
+def _read_mapped(path, parse):
+	"""Memory-map a file read-only and parse its contents without copying them.
+
+	Args:
+		path (str): The file to read.
+		parse (Callable): Called with a memoryview of the contents, or b'' for an
+			empty file (which cannot be mapped). It must not keep the view.
+
+	Returns:
+		The value returned by parse.
+	"""
+	with open(path, 'rb') as f:
+		if os.fstat(f.fileno()).st_size == 0:
+			return parse(b'')
+		with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+			return parse(view)
+
 def _get_config_nolock():
 	"""Load configuration from disk without acquiring any locks.
 
@@ -84,26 +148,93 @@ def _get_config_nolock():
 	"""
 	if os.path.exists(CONFIG_FILE):
 		try:
-			with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-				return json.load(f)
+			return _read_mapped(CONFIG_FILE, orjson.loads)
 		except Exception as e:
 			logging.error("Error loading config file: %s", e)
 	return None
 
-def get_config():
-	"""Thread-safe retrieval of the application configuration.
+def get_push_subscriptions():
+	"""Load the saved push subscriptions.
 
-	Acquires locks before reading the config file.
+	Subscriptions live in their own file so that subscribing rewrites only them.
+	Until that file exists, any subscriptions still stored in the config file
+	are returned instead.
 
 	Returns:
-		dict or None: The loaded configuration dictionary, or None if not initialized.
+		list: The saved subscription dictionaries.
+	"""
+	acquire_lock()
+	try:
+		if os.path.exists(SUBSCRIPTIONS_FILE):
+			try:
+				return _read_mapped(SUBSCRIPTIONS_FILE, orjson.loads) or []
+			except Exception as e:
+				logging.error("Error loading subscriptions file: %s", e)
+				return []
+		config = _get_config_nolock() or {}
+		return config.get(SavedConfig.PUSH_SUBSCRIPTIONS, [])
+	finally:
+		release_lock()
+
+def update_push_subscriptions(subscriptions: list):
+	"""Atomically replace the saved push subscriptions.
+
+	Args:
+		subscriptions (list): The subscription dictionaries to save.
 	"""
 	acquire_lock()
 	try:
-		return _get_config_nolock()
+		_atomic_write(SUBSCRIPTIONS_FILE, orjson.dumps(subscriptions))
 	finally:
 		release_lock()
 
+def _get_config_stamp():
+	"""Return the config file's (mtime_ns, inode, size), or None if it is missing.
+
+	Writers replace the file with os.replace, so the inode changes on every
+	write even where timestamps are too coarse to tell two writes apart.
+	"""
+	try:
+		st = os.stat(CONFIG_FILE)
+	except OSError:
+		return None
+	return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+def get_config():
+	"""Thread-safe retrieval of the application configuration.
+
+	The parsed configuration is cached in memory together with the file's
+	modification time, inode and size. While the file is unchanged, reads cost a single stat
+	call; a write from anywhere, including another process, triggers a reload.
+	Writers replace the file atomically, so reads take no lock.
+
+	The cache is an immutable (stamp, config) snapshot swapped in with a single
+	assignment. Writers bump `_config_seq` when they publish; a reader that
+	reloaded from disk only publishes its result if no writer did so meanwhile,
+	so it never replaces a newer snapshot with the one it started reading.
+
+	Returns:
+		dict or None: A shallow copy of the configuration dictionary, or None if not initialized.
+	"""
+	# pylint: disable=global-statement
+	global _config_cache
+	seq = _config_seq
+	cached = _config_cache
+	stamp = _get_config_stamp()
+	if cached is not None and cached[0] == stamp:
+		return dict(cached[1])
+	config = _get_config_nolock()
+	if _config_seq == seq:
+		_config_cache = (stamp, config) if config is not None and stamp else None
+	return dict(config) if config is not None else None
+
+def invalidate_config_cache():
+	"""Drop the in-memory configuration so the next read comes from disk."""
+	# pylint: disable=global-statement
+	global _config_cache, _config_seq
+	_config_seq += 1
+	_config_cache = None
+
 def update_config(updates: dict):
 	"""Thread-safe update of configuration values in the config file.
 
@@ -112,11 +243,45 @@ def update_config(updates: dict):
 	"""
 	acquire_lock()
 	try:
-		config = _get_config_nolock() or {}
-		for key, value in updates.items():
-			config[key] = value
-		with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-			json.dump(config, f, indent=2)
+		_update_config_nolock(updates)
+	finally:
+		release_lock()
+
+def _update_config_nolock(updates: dict):
+	"""Apply configuration updates and write the config file without acquiring any locks.
+
+	Args:
+		updates (dict): A mapping of config keys to their new values.
+	"""
+	# pylint: disable=global-statement
+	global _config_cache, _config_seq
+	config = _get_config_nolock() or {}
+	for key, value in updates.items():
+		config[key] = value
+	config_json = orjson.dumps(config, option=CONFIG_JSON_OPTIONS)
+	_atomic_write(CONFIG_FILE, config_json)
+	stamp = _get_config_stamp()
+	_config_seq += 1
+	_config_cache = (stamp, orjson.loads(config_json)) if stamp else None
+
+def update_config_and_keys(config_updates: dict, key_updates: dict):
+	"""Store secrets and update configuration values under a single lock.
+
+	In Docker all secrets are written to the secrets file in one pass rather
+	than once per key, and the config file is written once.
+
+	Args:
+		config_updates (dict): A mapping of config keys to their new values.
+		key_updates (dict): A mapping of SavedKey identifiers to secret values.
+	"""
+	acquire_lock()
+	try:
+		if is_running_in_docker():
+			_store_keys_nolock(key_updates)
+		else:
+			for key, value in key_updates.items():
+				keyring.set_password(KEYRING_SERVICE_NAME, key.value, value)
+		_update_config_nolock(config_updates)
 	finally:
 		release_lock()
 
@@ -167,7 +332,6 @@ def init_config():
 					SavedConfig.STARTUP_MODE: "local",
 					SavedConfig.SITE_DOMAIN: "localhost",
 					SavedConfig.TUNNEL_PROVIDER: None,
-					SavedConfig.PUSH_SUBSCRIPTIONS: [],
 					SavedConfig.CAMERA_STATES:
 											{"Stream":
 												{
@@ -201,11 +365,10 @@ def init_config():
 					SavedConfig.STARTUP_MODE: None,
 					SavedConfig.SITE_DOMAIN: None,
 					SavedConfig.TUNNEL_PROVIDER: None,
-					SavedConfig.PUSH_SUBSCRIPTIONS: [],
 					SavedConfig.CAMERA_STATES: {}
 				}
-		with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-			json.dump(default_config, f, indent=2)
+		_atomic_write(CONFIG_FILE, orjson.dumps(default_config, option=CONFIG_JSON_OPTIONS))
+		invalidate_config_cache()
 		logging.warning("Created new config file with version %s at %s",
 						CONFIG_VERSION,
 						CONFIG_FILE)
@@ -217,14 +380,69 @@ def _get_encryption_key(salt):
 	secret_key = os.environ.get("PRINTGUARD_SECRET_KEY")
 	if not secret_key:
 		return None
-	kdf = PBKDF2HMAC(
-		algorithm=hashes.SHA256(),
-		length=32,
-		salt=salt,
-		iterations=100000,
-	)
-	key = base64.urlsafe_b64encode(kdf.derive(secret_key.encode()))
-	return Fernet(key)
+	return _derive_encryption_key(secret_key, bytes(salt))
+
+@functools.lru_cache(maxsize=4)
+def _derive_encryption_key(secret_key, salt):
+	"""Runs PBKDF2 for a (secret, salt) pair, memoized for the process lifetime.
+
+	The salt is persisted at the start of the secrets file, so the derived key
+	is the same on every read and write until the secret or salt changes.
+	"""
+	return hashlib.pbkdf2_hmac('sha256', secret_key.encode(), salt, 100000, 32)
+
+def _encrypt_secrets(key, data):
+	"""Encrypts serialized secrets with AES-GCM.
+
+	Args:
+		key (bytes): The 32-byte derived key.
+		data (bytes): The plaintext to encrypt.
+
+	Returns:
+		bytes: A fresh 12-byte nonce followed by the ciphertext and tag.
+	"""
+	nonce = os.urandom(SECRETS_NONCE_SIZE)
+	return nonce + AESGCM(key).encrypt(nonce, data, None)
+
+def _decrypt_secrets(key, data):
+	"""Decrypts serialized secrets written by _encrypt_secrets.
+
+	Files written before the switch to AES-GCM hold a Fernet token instead; those
+	are still readable and are converted the next time a key is stored.
+
+	Args:
+		key (bytes): The 32-byte derived key.
+		data (bytes): The encrypted payload following the salt.
+
+	Returns:
+		bytes: The decrypted plaintext.
+	"""
+	try:
+		return AESGCM(key).decrypt(data[:SECRETS_NONCE_SIZE], data[SECRETS_NONCE_SIZE:], None)
+	except InvalidTag:
+		return Fernet(base64.urlsafe_b64encode(key)).decrypt(data)
+
+def _parse_secrets(file_content):
+	"""Decode the contents of the secrets file.
+
+	Args:
+		file_content (bytes | memoryview): The raw file contents.
+
+	Returns:
+		dict or None: The secrets, or None if they cannot be decrypted.
+	"""
+	if not file_content:
+		return {}
+	secret_key = os.environ.get("PRINTGUARD_SECRET_KEY")
+	if secret_key:
+		salt = bytes(file_content[:16])
+		encrypted_data = bytes(file_content[16:])
+		encryption_key = _get_encryption_key(salt)
+		if encryption_key:
+			decrypted_data = _decrypt_secrets(encryption_key, encrypted_data)
+			return orjson.loads(decrypted_data)
+		return None
+	return orjson.loads(file_content)
 
 def _get_secrets_nolock():
 	"""Load secrets from disk without acquiring any locks.
@@ -234,20 +452,7 @@ def _get_secrets_nolock():
 	"""
 	if os.path.exists(SECRETS_FILE):
 		try:
-			with open(SECRETS_FILE, 'rb') as f:
-				file_content = f.read()
-			if not file_content:
-				return {}
-			secret_key = os.environ.get("PRINTGUARD_SECRET_KEY")
-			if secret_key:
-				salt = file_content[:16]
-				encrypted_data = file_content[16:]
-				fernet = _get_encryption_key(salt)
-				if fernet:
-					decrypted_data = fernet.decrypt(encrypted_data)
-					return json.loads(decrypted_data)
-			else:
-				return json.loads(file_content)
+			return _read_mapped(SECRETS_FILE, _parse_secrets)
 		except Exception as e:
 			logging.error("Error loading secrets file: %s", e)
 	return None
@@ -262,28 +467,35 @@ def store_key(key: SavedKey, value: str):
 	if is_running_in_docker():
 		acquire_lock()
 		try:
-			secrets = _get_secrets_nolock() or {}
-			secrets[key.value] = value
-			data_to_write = json.dumps(secrets, indent=2).encode('utf-8')
-			secret_key = os.environ.get("PRINTGUARD_SECRET_KEY")
-			if secret_key:
-				if os.path.exists(SECRETS_FILE) and os.path.getsize(SECRETS_FILE) > 16:
-					with open(SECRETS_FILE, 'rb') as f:
-						salt = f.read(16)
-				else:
-					salt = os.urandom(16)
-				fernet = _get_encryption_key(salt)
-				if fernet:
-					encrypted_data = fernet.encrypt(data_to_write)
-					data_to_write = salt + encrypted_data
-			with open(SECRETS_FILE, 'wb') as f:
-				f.write(data_to_write)
-			os.chmod(SECRETS_FILE, 0o600)
+			_store_keys_nolock({key: value})
 		finally:
 			release_lock()
 	else:
 		keyring.set_password(KEYRING_SERVICE_NAME, key.value, value)
 
+def _store_keys_nolock(key_updates: dict):
+	"""Write secrets to the secrets file without acquiring any locks.
+
+	Args:
+		key_updates (dict): A mapping of SavedKey identifiers to secret values.
+	"""
+	secrets = _get_secrets_nolock() or {}
+	for key, value in key_updates.items():
+		secrets[key.value] = value
+	data_to_write = orjson.dumps(secrets, option=orjson.OPT_INDENT_2)
+	secret_key = os.environ.get("PRINTGUARD_SECRET_KEY")
+	if secret_key:
+		if os.path.exists(SECRETS_FILE) and os.path.getsize(SECRETS_FILE) > 16:
+			with open(SECRETS_FILE, 'rb') as f:
+				salt = f.read(16)
+		else:
+			salt = os.urandom(16)
+		encryption_key = _get_encryption_key(salt)
+		if encryption_key:
+			encrypted_data = _encrypt_secrets(encryption_key, data_to_write)
+			data_to_write = salt + encrypted_data
+	_atomic_write(SECRETS_FILE, data_to_write, mode=0o600)
+
 def get_key(key: SavedKey):
 	"""Retrieve a secret value from the system keyring or a secure file if in Docker.
 
@@ -294,12 +506,8 @@ def get_key(key: SavedKey):
 		str or None: The stored secret, or None if not found.
 	"""
 	if is_running_in_docker():
-		acquire_lock()
-		try:
-			secrets = _get_secrets_nolock()
-			return secrets.get(key.value) if secrets else None
-		finally:
-			release_lock()
+		secrets = _get_secrets_nolock()
+		return secrets.get(key.value) if secrets else None
 	else:
 		return keyring.get_password(KEYRING_SERVICE_NAME, key.value)
 
@@ -322,6 +530,7 @@ def get_ssl_private_key_temporary_path():
 
 def reset_all_keys():
 	"""Delete all stored keys in the system keyring for the application."""
+	_derive_encryption_key.cache_clear()
 	if is_running_in_docker():
 		acquire_lock()
 		try:
@@ -350,11 +559,10 @@ def reset_config():
 			SavedConfig.STARTUP_MODE: None,
 			SavedConfig.SITE_DOMAIN: None,
 			SavedConfig.TUNNEL_PROVIDER: None,
-			SavedConfig.PUSH_SUBSCRIPTIONS: [],
 			SavedConfig.CAMERA_STATES: {}
 		}
-		with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-			json.dump(default_config, f, indent=2)
+		_atomic_write(CONFIG_FILE, orjson.dumps(default_config, option=CONFIG_JSON_OPTIONS))
+		invalidate_config_cache()
 	finally:
 		release_lock()
 
@@ -364,18 +572,30 @@ def reset_ssl_files():
 		if os.path.exists(ssl_file):
 			os.remove(ssl_file)
 
+def reset_push_subscriptions():
+	"""Delete the saved push subscriptions file."""
+	acquire_lock()
+	try:
+		if os.path.exists(SUBSCRIPTIONS_FILE):
+			os.remove(SUBSCRIPTIONS_FILE)
+	finally:
+		release_lock()
+
 def reset_all():
-	"""Reset keyring, config, and SSL files to a clean state.
+	"""Reset keyring, config, push subscription and SSL files to a clean state.
 
-	Invokes `reset_all_keys`, `reset_config`, and `reset_ssl_files` sequentially.
+	Invokes `reset_all_keys`, `reset_config`, `reset_push_subscriptions`, and
+	`reset_ssl_files` sequentially.
 	"""
 	reset_all_keys()
 	reset_config()
+	reset_push_subscriptions()
 	reset_ssl_files()
-	logging.debug("All saved keys, config, and SSL files have been reset")
+	logging.debug("All saved keys, config, push subscriptions, and SSL files have been reset")
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 
+@functools.lru_cache(maxsize=1)
 def get_model_path() -> str:
 	"""Get the model path for the detected backend."""
 	try:
@@ -383,6 +603,7 @@ def get_model_path() -> str:
 	except ImportError:
 		return os.path.join(BASE_DIR, "model", "model.onnx")
 
+@functools.lru_cache(maxsize=1)
 def get_model_options_path() -> str:
 	"""Get the model options path."""
 	try:
@@ -390,6 +611,7 @@ def get_model_options_path() -> str:
 	except ImportError:
 		return os.path.join(BASE_DIR, "model", "opt.json")
 
+@functools.lru_cache(maxsize=1)
 def get_prototypes_dir() -> str:
 	"""Get the prototypes directory path."""
 	try:
@@ -397,22 +619,36 @@ def get_prototypes_dir() -> str:
 	except ImportError:
 		return os.path.join(BASE_DIR, "model", "prototypes")
 
+def invalidate_model_paths():
+	"""Clear the cached model, options, and prototypes paths."""
+	get_model_path.cache_clear()
+	get_model_options_path.cache_clear()
+	get_prototypes_dir.cache_clear()
+
+@functools.lru_cache(maxsize=1)
+def get_device_type() -> str:
+	"""Detect the torch device to run inference on.
+
+	torch is imported on first use rather than with this module, since probing
+	CUDA and MPS loads native libraries that only the inference path needs.
+
+	Returns:
+		str: "cuda", "mps", or "cpu" (also when torch is not installed).
+	"""
+	try:
+		# pylint: disable=import-outside-toplevel
+		import torch
+	except ImportError:
+		return "cpu"
+	if torch.cuda.is_available():
+		return "cuda"
+	if torch.backends.mps.is_available():
+		return "mps"
+	return "cpu"
+
 SUCCESS_LABEL = "success"
-DEVICE_TYPE = "cuda" if (torch.cuda.is_available()) else (
-	"mps" if (torch.backends.mps.is_available()) else "cpu")
-SENSITIVITY = 1.0
 DETECTION_TIMEOUT = 5
 DETECTION_THRESHOLD = 3
-DETECTION_VOTING_WINDOW = 5
-DETECTION_VOTING_THRESHOLD = 2
-MAX_CAMERA_HISTORY = 10_000
-
-BRIGHTNESS = 1.0
-CONTRAST = 1.0
-FOCUS = 1.0
-
-COUNTDOWN_TIME = 60
-COUNTDOWN_ACTION = AlertAction.DISMISS
 
 DETECTIONS_PER_SECOND = 15
 
@@ -420,6 +656,10 @@ STREAM_MAX_FPS = 30
 STREAM_TUNNEL_FPS = 10
 STREAM_JPEG_QUALITY = 85
 STREAM_TUNNEL_JPEG_QUALITY = 60
+PREVIEW_JPEG_QUALITY = 75
+PREVIEW_MAX_FPS = 5
+# Encode JPEG frames with PyTurboJPEG when it is installed
+USE_TURBOJPEG = True
 STREAM_MAX_WIDTH = 1280
 STREAM_TUNNEL_MAX_WIDTH = 640
 DETECTION_INTERVAL_MS = 1000 / DETECTIONS_PER_SECOND
@@ -0,0 +1,20 @@
+"""Per-camera setting defaults.
+
+Kept free of project imports so that both models and utils.config can import
+it at module level without a circular dependency.
+"""
+
+SENSITIVITY = 1.0
+DETECTION_VOTING_WINDOW = 5
+DETECTION_VOTING_THRESHOLD = 2
+
+BRIGHTNESS = 1.0
+CONTRAST = 1.0
+FOCUS = 1.0
+
+# Detections kept per camera for the frame rate and voting statistics
+MAX_CAMERA_HISTORY = 10_000
+
+COUNTDOWN_TIME = 60
+# Value of models.AlertAction.DISMISS
+COUNTDOWN_ACTION = "dismiss"
@@ -1,7 +1,6 @@
 import asyncio
 import uuid
 import logging
-import cv2
 
 from utils.alert_utils import (dismiss_alert, alert_to_response_json,
                           get_alert, append_new_alert)
@@ -10,6 +9,8 @@ from utils.camera_utils import (get_camera_state, get_camera_state_sync,
                            update_camera_state, update_camera_detection_history)
 from utils.printer_utils import get_printer_config, suspend_print_job
 from utils.notification_utils import send_defect_notification
+from utils.config import STREAM_JPEG_QUALITY
+from utils.jpeg_utils import encode_jpeg
 from models import Alert, AlertAction, SSEDataType
 
 def _passed_majority_vote(camera_state):
@@ -24,12 +25,17 @@ def _passed_majority_vote(camera_state):
               `majority_vote_window` entries is at least `majority_vote_threshold`.
     """
     detection_history = camera_state.detection_history
-    majority_vote_window = camera_state.majority_vote_window
     majority_vote_threshold = camera_state.majority_vote_threshold
-    results_to_retreive = min(len(detection_history), majority_vote_window)
-    detection_window_results = detection_history[-results_to_retreive:]
-    failed_detections = [res for res in detection_window_results if res[1] == 'failure']
-    return len(failed_detections) >= majority_vote_threshold
+    if majority_vote_threshold <= 0:
+        return True
+    results_to_retreive = min(len(detection_history), camera_state.majority_vote_window)
+    failed_detections = 0
+    for offset in range(1, results_to_retreive + 1):
+        if detection_history[-offset][1] == 'failure':
+            failed_detections += 1
+            if failed_detections >= majority_vote_threshold:
+                return True
+    return False
 
 async def _send_alert(alert):
     """Send an alert to clients via Server-Sent Events.
@@ -55,10 +61,11 @@ async def _terminate_alert_after_cooldown(alert):
             case AlertAction.DISMISS:
                 await dismiss_alert(alert.id)
             case AlertAction.CANCEL_PRINT | AlertAction.PAUSE_PRINT:
-                suspend_print_job(camera_uuid, camera_state.countdown_action)
+                await suspend_print_job(camera_uuid, camera_state.countdown_action)
                 return await dismiss_alert(alert.id)
 
-async def _create_alert_and_notify(camera_state_ref, camera_uuid, frame, timestamp_arg):
+async def _create_alert_and_notify(camera_state_ref, camera_uuid, frame, timestamp_arg,
+                                   frame_jpeg=None):
     """Create a new Alert object and notify all subsystems.
 
     Args:
@@ -66,26 +73,28 @@ async def _create_alert_and_notify(camera_state_ref, camera_uuid, frame, timesta
         camera_uuid (str): The UUID of the camera.
         frame (ndarray): The image frame where a defect was detected.
         timestamp_arg (float): The timestamp of detection.
+        frame_jpeg (bytes, optional): An existing JPEG encoding of `frame`. When
+            omitted, the frame is encoded in a worker thread.
 
     Returns:
         Alert: The newly created alert.
     """
-    alert_id = f"{camera_uuid}_{str(uuid.uuid4())}"
-    # pylint: disable=E1101
-    _, img_buf = cv2.imencode('.jpg', frame)
+    alert_id = f"{camera_uuid}_{uuid.uuid4().hex}"
+    if frame_jpeg is None:
+        frame_jpeg = await asyncio.to_thread(encode_jpeg, frame, STREAM_JPEG_QUALITY)
     has_printer = get_printer_config(camera_uuid) is not None
     alert = Alert(
         id=alert_id,
         camera_uuid=camera_uuid,
         timestamp=timestamp_arg,
-        snapshot=img_buf.tobytes(),
+        snapshot=frame_jpeg,
         title=f"Defect - Camera {camera_state_ref.nickname}",
         message=f"Defect detected on camera {camera_state_ref.nickname}",
         countdown_time=camera_state_ref.countdown_time,
         countdown_action=camera_state_ref.countdown_action,
         has_printer=has_printer,
     )
-    append_new_alert(alert)
+    await append_new_alert(alert)
     asyncio.create_task(_terminate_alert_after_cooldown(alert))
     await update_camera_state(camera_uuid, {"current_alert_id": alert_id})
     await send_defect_notification(alert_id)
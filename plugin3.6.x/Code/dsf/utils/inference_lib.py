@@ -1,29 +1,29 @@
+import functools
+import importlib.util
 import logging
 from typing import Optional
 from utils.inference_engine import UniversalInferenceEngine, InferenceBackend
 
 _inference_engine: Optional[UniversalInferenceEngine] = None
 
+@functools.lru_cache(maxsize=1)
 def _detect_backend() -> InferenceBackend:
-    """Detect the best available backend based on installed packages.""" 
+    """Detect the best available backend based on installed packages.
+
+    Packages are located with importlib.util.find_spec rather than imported,
+    so choosing a backend does not load ONNX Runtime or torch.
+    """
     # Check for ONNX Runtime (optimized backend)
-    try:
-        import onnxruntime
+    if importlib.util.find_spec("onnxruntime") is not None:
         logging.info("ONNX Runtime detected, using ONNX Runtime backend")
         return InferenceBackend.ONNXRUNTIME
-    except ImportError:
-        pass
     # Check for PyTorch (fallback backend)
-    try:
-        import torch
+    if importlib.util.find_spec("torch") is not None:
         logging.info("PyTorch detected, using PyTorch backend")
         return InferenceBackend.PYTORCH
-    except ImportError:
-        pass
     logging.warning("No specific backend detected, defaulting to PyTorch")
     return InferenceBackend.PYTORCH
 
-
 def get_inference_engine() -> UniversalInferenceEngine:
     """Get or create the global inference engine instance."""
     # pylint: disable=import-outside-toplevel
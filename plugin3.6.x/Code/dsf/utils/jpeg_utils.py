@@ -0,0 +1,55 @@
+import logging
+
+import cv2  # pylint: disable=E0401
+import numpy as np
+
+from utils.config import USE_TURBOJPEG
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJFLAG_PROGRESSIVE
+except ImportError:
+    TurboJPEG = None
+
+_turbo_jpeg = None
+if USE_TURBOJPEG and TurboJPEG is not None:
+    try:
+        _turbo_jpeg = TurboJPEG()
+    except (OSError, RuntimeError) as e:
+        logging.warning("libjpeg-turbo could not be loaded, using OpenCV JPEG encoding: %s", e)
+
+
+def is_turbojpeg_available() -> bool:
+    """Return True if frames are encoded with libjpeg-turbo."""
+    return _turbo_jpeg is not None
+
+
+def encode_jpeg(frame: np.ndarray, quality: int = 95,
+                progressive: bool = False, optimize: bool = False) -> bytes:
+    """Encode a BGR frame as JPEG.
+
+    PyTurboJPEG's SIMD encoder is used when it is installed and enabled;
+    otherwise the frame is encoded with cv2.imencode.
+
+    Args:
+        frame (np.ndarray): The BGR frame to encode.
+        quality (int): JPEG quality from 1 to 100.
+        progressive (bool): Produce a progressive JPEG.
+        optimize (bool): Optimize Huffman tables. Only applies to OpenCV,
+            libjpeg-turbo always uses its default tables.
+
+    Returns:
+        bytes: The JPEG-encoded byte string.
+    """
+    if _turbo_jpeg is not None:
+        flags = TJFLAG_PROGRESSIVE if progressive else 0
+        return _turbo_jpeg.encode(frame, quality=quality, pixel_format=TJPF_BGR, flags=flags)
+    # pylint: disable=E1101
+    encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    if optimize:
+        encode_params.extend([cv2.IMWRITE_JPEG_OPTIMIZE, 1])
+    if progressive:
+        encode_params.extend([cv2.IMWRITE_JPEG_PROGRESSIVE, 1])
+    success, buffer = cv2.imencode('.jpg', frame, encode_params)
+    if not success:
+        _, buffer = cv2.imencode('.jpg', frame)
+    return buffer.tobytes()
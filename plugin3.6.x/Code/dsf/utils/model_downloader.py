@@ -101,6 +101,9 @@ class ModelDownloader:
             if downloaded_path != local_path:
                 os.rename(downloaded_path, local_path)
             logging.info("Successfully downloaded %s to %s", filename, local_path)
+            # pylint: disable=import-outside-toplevel
+            from .config import invalidate_model_paths
+            invalidate_model_paths()
             return True
         except (OSError, ValueError, RuntimeError) as e:
             logging.error("Failed to download %s: %s", filename, e)
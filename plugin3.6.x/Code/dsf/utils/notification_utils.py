@@ -1,40 +1,102 @@
 from urllib.parse import urlparse
+import asyncio
+import functools
 import logging
-import json
+import time
+import orjson
+from py_vapid import Vapid
 from pywebpush import WebPushException, webpush
 
 from models import Notification, SavedKey, SavedConfig
-from utils.config import get_key, get_config
+from utils.config import get_key, get_config, update_push_subscriptions
 from utils.alert_utils import get_alert
+from utils.app_ref import get_app
+
+# Subscription changes within this window are written to disk together
+SUBSCRIPTION_FLUSH_DELAY_S = 0.5
 
 def get_subscriptions():
-    """Retrieve the list of current push notification subscriptions.
+    """Retrieve the current push notification subscriptions.
+
+    Subscriptions are held in app.state.subscriptions, keyed by endpoint.
+
+    Returns:
+        list: A list of subscription dictionaries, each with at least an 'endpoint' and 'keys'.
+    """
+    app = get_app()
+    return list(app.state.subscriptions.values())
+
+def get_subscription_audience(subscription):
+    """Get the VAPID audience (push service origin) of a subscription.
+
+    The audience is parsed from the endpoint once and stored on the
+    subscription under 'aud'; subscriptions saved without it get it on first use.
+
+    Args:
+        subscription (dict): The subscription object with an 'endpoint'.
 
     Returns:
-        list: A list of subscription dictionaries, each with at least an 'id' and 'endpoint'.
+        str: The endpoint's scheme and host, e.g. 'https://fcm.googleapis.com'.
     """
-    # pylint: disable=C0415
-    from app import app
-    return app.state.subscriptions
+    audience = subscription.get('aud')
+    if audience is None:
+        parsed_endpoint = urlparse(subscription['endpoint'])
+        audience = subscription.setdefault(
+            'aud', f"{parsed_endpoint.scheme}://{parsed_endpoint.netloc}")
+    return audience
 
 def remove_subscription(subscription_id = None, subscription = None):
     """Remove a subscription by ID or subscription object.
 
     Args:
-        subscription_id (str, optional): The ID of the subscription to remove.
+        subscription_id (str, optional): The ID (endpoint) of the subscription to remove.
         subscription (dict, optional): The subscription object to remove.
     """
-    # pylint: disable=C0415
-    from app import app
+    app = get_app()
+    if subscription_id is None and subscription is not None:
+        subscription_id = subscription.get('endpoint')
     if subscription_id is not None:
-        app.state.subscriptions = [
-            sub for sub in app.state.subscriptions if sub.get('id') != subscription_id
-        ]
-    elif subscription is not None:
-        app.state.subscriptions.remove(subscription)
+        if app.state.subscriptions.pop(subscription_id, None) is not None:
+            mark_subscriptions_dirty()
     else:
         logging.error("No subscription ID or object provided to remove.")
 
+def mark_subscriptions_dirty():
+    """Schedule app.state.subscriptions to be written to disk.
+
+    Must be called from the event loop. Writes are debounced by a single
+    background task, so a burst of changes results in one write.
+    """
+    app = get_app()
+    app.state.subscriptions_dirty.set()
+    if app.state.subscription_flush_task is None:
+        app.state.subscription_flush_task = asyncio.create_task(_subscription_flusher())
+
+async def _subscription_flusher():
+    """Persist subscriptions once per debounce window while changes keep arriving."""
+    app = get_app()
+    dirty = app.state.subscriptions_dirty
+    while True:
+        await dirty.wait()
+        await asyncio.sleep(SUBSCRIPTION_FLUSH_DELAY_S)
+        dirty.clear()
+        try:
+            await asyncio.to_thread(update_push_subscriptions, get_subscriptions())
+        except Exception as e:
+            logging.error("Failed to persist push subscriptions: %s", e)
+            dirty.set()
+
+async def flush_subscriptions():
+    """Stop the background flusher and write any pending subscription changes."""
+    app = get_app()
+    task = app.state.subscription_flush_task
+    app.state.subscription_flush_task = None
+    if task is not None:
+        task.cancel()
+    if app.state.subscriptions_dirty.is_set():
+        app.state.subscriptions_dirty.clear()
+        await asyncio.to_thread(update_push_subscriptions, get_subscriptions())
+
 async def send_defect_notification(alert_id):
     """Send a defect notification for a given alert ID to all subscribers.
 
@@ -56,13 +118,104 @@ async def send_defect_notification(alert_id):
         subscriptions = get_subscriptions() or []
         logging.debug("Created notification object without image payload, sending to %d subscriptions",
                       len(subscriptions))
-        send_notification(notification)
+        await send_notification(notification)
     else:
         logging.error("No alert found for ID: %s", alert_id)
 
-def send_notification(notification: Notification):
+VAPID_TOKEN_BUCKET_S = 3600
+VAPID_TOKEN_LIFETIME_S = 12 * 60 * 60
+
+_vapid_settings = None
+
+def get_vapid_settings():
+    """Get the VAPID subject and private key used to sign push messages.
+
+    Once both are configured they are kept in memory, so sending a notification
+    does not read the config file or the keyring. Call invalidate_vapid_cache()
+    after changing them.
+
+    Returns:
+        tuple[str | None, str | None]: The VAPID subject and private key.
+    """
+    # pylint: disable=global-statement
+    global _vapid_settings
+    if _vapid_settings is not None:
+        return _vapid_settings
+    config = get_config() or {}
+    settings = (config.get(SavedConfig.VAPID_SUBJECT, None),
+                get_key(SavedKey.VAPID_PRIVATE_KEY))
+    if all(settings):
+        _vapid_settings = settings
+    return settings
+
+def invalidate_vapid_cache():
+    """Forget the cached VAPID settings so the next send reloads them."""
+    # pylint: disable=global-statement
+    global _vapid_settings
+    _vapid_settings = None
+
+@functools.lru_cache(maxsize=32)
+def _vapid_headers(audience, vapid_private_key, vapid_subject, exp_bucket):
+    """Sign VAPID auth headers for a push service, reused for up to an hour.
+
+    Push endpoints of the same service share an audience, so one ES256 signature
+    serves all of them. The token expires VAPID_TOKEN_LIFETIME_S after the start
+    of its hourly bucket, well within the 24 hour limit push services accept.
+
+    Args:
+        audience (str): The push service origin, e.g. 'https://fcm.googleapis.com'.
+        vapid_private_key (str): The VAPID private key.
+        vapid_subject (str): The VAPID 'sub' claim.
+        exp_bucket (int): The current hour, as int(time.time() // VAPID_TOKEN_BUCKET_S).
+
+    Returns:
+        dict: The Authorization (and related) headers. Callers must copy before mutating.
+    """
+    claims = {
+        "sub": vapid_subject,
+        "aud": audience,
+        "exp": exp_bucket * VAPID_TOKEN_BUCKET_S + VAPID_TOKEN_LIFETIME_S,
+    }
+    return Vapid.from_string(private_key=vapid_private_key).sign(claims)
+
+def _push_to_subscription(index, sub, data_payload, vapid_headers):
+    """Deliver one push message. Blocking; runs in a worker thread.
+
+    Args:
+        index (int): Position of the subscription, used for logging.
+        sub (dict): The subscription info with 'endpoint' and 'keys'.
+        data_payload (bytes): The encoded notification payload.
+        vapid_headers (dict): Signed VAPID headers for the endpoint's push service.
+
+    Returns:
+        tuple[bool, bool]: Whether the message was sent, and whether the
+            subscription has expired and should be removed.
+    """
+    try:
+        logging.debug("Sending to endpoint: %s", sub['endpoint'])
+        webpush(
+            subscription_info=sub,
+            data=data_payload,
+            headers=dict(vapid_headers)
+        )
+        logging.debug("Successfully sent notification to subscription %d", index+1)
+        return True, False
+    except WebPushException as ex:
+        logging.error("WebPush failed for subscription %d: %s", index+1, ex)
+        if ex.response and ex.response.status_code == 410:
+            return False, True
+        logging.error("Push failed: %s", ex)
+    except Exception as e:
+        logging.error("Unexpected error sending notification to subscription %d: %s", index+1, e)
+    return False, False
+
+async def send_notification(notification: Notification):
     """Send a push notification to all current subscriptions.
 
+    The payload is encoded and the VAPID headers are signed once per push
+    service; deliveries then run concurrently in worker threads, so the total
+    time is roughly that of the slowest push service rather than the sum of all.
+
     Args:
         notification (Notification): The notification object to send. Should have 'title' and 'body' fields at minimum.
 
@@ -70,61 +223,54 @@ def send_notification(notification: Notification):
         bool: True if at least one notification was sent successfully, False otherwise.
     """
     logging.debug("Starting notification send process")
-    config = get_config()
-    vapid_subject = config.get(SavedConfig.VAPID_SUBJECT, None)
+    subscriptions = get_subscriptions()
+    if not subscriptions:
+        logging.warning("No push subscriptions available to send notifications")
+        return False
+    vapid_subject, vapid_private_key = get_vapid_settings()
     if not vapid_subject:
         logging.error("VAPID subject is not set in the configuration.")
         return False
-    vapid_private_key = get_key(SavedKey.VAPID_PRIVATE_KEY)
     if not vapid_private_key:
         logging.error("VAPID private key is not set in the configuration.")
         return False
-    subscriptions = get_subscriptions()
     logging.debug("VAPID configuration found. Subject: %s", vapid_subject)
     logging.debug("Number of subscriptions: %d", len(subscriptions))
-    vapid_claims = {
-        "sub": vapid_subject,
-        "aud": None,
+    payload_dict = {
+        'title': notification.title,
+        'body': notification.body
     }
-    success_count = 0
-    if not subscriptions:
-        logging.warning("No push subscriptions available to send notifications")
-        return False
-    for i, sub in enumerate(subscriptions.copy()):
-        logging.debug("Sending notification to subscription %d/%d",
-                      i+1, len(subscriptions))
-        try:
-            endpoint = sub.get('endpoint', '')
-            if not endpoint:
-                logging.error("Subscription %d has no endpoint", i+1)
+    data_payload = orjson.dumps(payload_dict)
+    exp_bucket = int(time.time() // VAPID_TOKEN_BUCKET_S)
+    headers_by_audience = {}
+    deliveries = []
+    for i, sub in enumerate(subscriptions):
+        endpoint = sub.get('endpoint', '')
+        if not endpoint:
+            logging.error("Subscription %d has no endpoint", i+1)
+            continue
+        audience = get_subscription_audience(sub)
+        vapid_headers = headers_by_audience.get(audience)
+        if vapid_headers is None:
+            try:
+                vapid_headers = _vapid_headers(audience, vapid_private_key,
+                                               vapid_subject, exp_bucket)
+            except Exception as e:
+                logging.error("Failed to sign VAPID headers for %s: %s", audience, e)
                 continue
-            parsed_endpoint = urlparse(endpoint)
-            audience = f"{parsed_endpoint.scheme}://{parsed_endpoint.netloc}"
-            aud_vapid_claims = dict(vapid_claims)
-            aud_vapid_claims['aud'] = audience
-            payload_dict = {
-                'title': notification.title,
-                'body': notification.body
-            }
-            data_payload = json.dumps(payload_dict)
-            logging.debug("Sending to endpoint: %s", endpoint)
-            webpush(
-                subscription_info=sub,
-                data=data_payload,
-                vapid_private_key=vapid_private_key,
-                vapid_claims=aud_vapid_claims
-            )
+            headers_by_audience[audience] = vapid_headers
+        deliveries.append((i, sub, vapid_headers))
+    results = await asyncio.gather(*(
+        asyncio.to_thread(_push_to_subscription, i, sub, data_payload, vapid_headers)
+        for i, sub, vapid_headers in deliveries
+    ))
+    success_count = 0
+    for (_, sub, _), (sent, expired) in zip(deliveries, results):
+        if sent:
             success_count += 1
-            logging.debug("Successfully sent notification to subscription %d", i+1)
-        except WebPushException as ex:
-            logging.error("WebPush failed for subscription %d: %s", i+1, ex)
-            if ex.response and ex.response.status_code == 410:
-                remove_subscription(subscription=sub)
-                logging.info("Subscription expired and removed: %s", sub.get('endpoint', 'unknown'))
-            else:
-                logging.error("Push failed: %s", ex)
-        except Exception as e:
-            logging.error("Unexpected error sending notification to subscription %d: %s", i+1, e)
+        elif expired:
+            remove_subscription(subscription=sub)
+            logging.info("Subscription expired and removed: %s", sub.get('endpoint', 'unknown'))
 
     logging.debug("Notification send complete. Success count: %d/%d", success_count, len(subscriptions))
     return success_count > 0
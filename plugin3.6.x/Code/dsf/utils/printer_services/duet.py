@@ -1,8 +1,19 @@
-from typing import Dict
-import requests
-from models import (FileInfo, JobInfoResponse,
-                       TemperatureReadings, TemperatureReading,
-                       PrinterState, PrinterTemperatures)
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import httpx
+from models import (DuetStatus, FileInfo, JobInfoResponse, Progress,
+                       TemperatureReading, PrinterState, PrinterTemperatures)
+from utils.config import PRINTER_STAT_POLLING_RATE_MS
+
+# Statuses returned while the board is changing state
+BUSY_STATUS_CODES = frozenset({409, 503})
+JOB_COMMAND_RETRIES = 3
+JOB_COMMAND_BACKOFF_S = 0.1
+
+
+class PrinterBusyError(Exception):
+    """Raised when the printer keeps rejecting a job command as busy."""
 
 
 class duet3DClient:
@@ -11,28 +22,201 @@ class duet3DClient:
     
     This class provides methods to control and monitor 3D printers through
     duet3D's htttp interface, including job management, temperature monitoring,
-    and printer state retrieval.
+    and printer state retrieval. All methods are coroutines, so polling a
+    printer never blocks the event loop.
     
     Attributes:
         base_url (str): The base URL of the duet3D instance
         headers (dict): HTTP headers including password for authentication
+        http_client (httpx.AsyncClient): Pooled async client used for all requests
+        cache_ttl_s (float): How long a fetched object model is reused for
     """
+
+    __slots__ = ("base_url", "headers", "http_client", "cache_ttl_s",
+                 "_url_model", "_url_job", "_owns_client", "_request_headers",
+                 "_cache", "_cache_locks", "_job_lock")
     
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 cache_ttl_s: float = PRINTER_STAT_POLLING_RATE_MS / 1000):
         """
         Initialize the duet3D client.
         
         Args:
             base_url (str): The base URL of the duet3D instance (e.g., 'http://duet3d.local')
             api_key (str): The password for authentication with duet3D
+            http_client (Optional[httpx.AsyncClient]): Application-wide async HTTP client,
+                usually app.state.http_async_client. If omitted, the client creates and
+                owns a keep-alive client of its own.
+            cache_ttl_s (float): Seconds during which repeated reads share one response.
+                Defaults to the printer stat polling interval.
         """
         self.base_url = base_url.rstrip("/")
-        self.headers = {
-            "X-Api-Key": api_key,
-            "Content-Type": "application/json"
-        }
+        self._url_model = f"{self.base_url}/machine/model"
+        self._url_job = f"{self.base_url}/api/job"
+        # httpx sets Content-Type itself for the json= bodies of POST requests
+        self.headers = {"X-Api-Key": api_key}
+        self._owns_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(
+            headers=self.headers,
+            timeout=10,
+            limits=httpx.Limits(max_connections=4, keepalive_expiry=30),
+            transport=httpx.AsyncHTTPTransport(retries=2)
+        )
+        # An owned client carries the headers itself; a shared client serves
+        # other printers, so they have to be sent with each request instead
+        self._request_headers = None if self._owns_client else self.headers
+        self.cache_ttl_s = cache_ttl_s
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_locks: Dict[str, asyncio.Lock] = {}
+        self._job_lock = asyncio.Lock()
+
+    async def close(self) -> None:
+        """Close the HTTP client if this instance created it."""
+        if self._owns_client:
+            await self.http_client.aclose()
+
+    def invalidate(self) -> None:
+        """Drop all cached responses so the next read goes to the printer."""
+        self._cache.clear()
+
+    async def _cached(self, key: str, ttl: float,
+                      fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return a cached value for key, fetching it if missing or older than ttl.
+
+        Concurrent callers that miss the cache wait on a per-key lock, so only
+        one of them performs the upstream request.
+
+        Args:
+            key (str): Cache key
+            ttl (float): Maximum age of a cached value in seconds
+            fetch (Callable[[], Awaitable[Any]]): Coroutine function producing a fresh value
+
+        Returns:
+            Any: The cached or freshly fetched value
+        """
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        lock = self._cache_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+            value = await fetch()
+            self._cache[key] = (time.monotonic(), value)
+            return value
+
+    async def _fetch_status(self) -> DuetStatus:
+        """
+        Retrieve the machine object model in a single request.
+
+        DSF's /machine/model returns job, heater and state information together,
+        so every accessor below is derived from this one response. Responses are
+        reused for cache_ttl_s seconds.
+
+        Returns:
+            DuetStatus: The state, job, heat and tools sections of the object model
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
+        """
+        return await self._cached("status", self.cache_ttl_s, self._request_status)
+
+    async def _request_status(self) -> DuetStatus:
+        """Perform the uncached /machine/model request."""
+        resp = await self.http_client.get(self._url_model, headers=self._request_headers)
+        resp.raise_for_status()
+        return DuetStatus.model_validate_json(resp.content)
+
+    @staticmethod
+    def _job_info_from_status(status: DuetStatus) -> JobInfoResponse:
+        """
+        Map the object model's job section onto a JobInfoResponse.
+
+        The object model comes from the printer's own firmware and has already
+        been validated as a DuetStatus, so the derived models are built with
+        model_construct to skip a second round of validation on every poll.
+
+        Args:
+            status (DuetStatus): The machine object model
+
+        Returns:
+            JobInfoResponse: Job information with completion as a percentage (0-100),
+                matching OctoPrint
+        """
+        job = status.job
+        file = job.get("file") or {}
+        size = file.get("size") or 0
+        file_position = job.get("filePosition")
+        times_left = job.get("timesLeft") or {}
+        return JobInfoResponse.model_construct(
+            job={"file": FileInfo.model_construct(name=file.get("fileName"), size=size or None)},
+            progress=Progress.model_construct(
+                completion=(file_position / size * 100) if size and file_position is not None else None,
+                filepos=file_position,
+                printTime=job.get("duration"),
+                printTimeLeft=times_left.get("file"),
+            ),
+            state=status.state.get("status", "unknown"),
+        )
+
+    @staticmethod
+    def _temperatures_from_status(status: DuetStatus) -> Dict[str, TemperatureReading]:
+        """
+        Map the object model's heaters onto 'tool0' and 'bed' temperature readings.
+
+        Readings are built with model_construct, as heater values come from the
+        trusted firmware payload.
+
+        Args:
+            status (DuetStatus): The machine object model
+
+        Returns:
+            Dict[str, TemperatureReading]: Readings for the first tool and bed heaters
+                                         that are present
+        """
+        heaters = status.heat.get("heaters") or []
+        heater_indices = {}
+        bed_heaters = status.heat.get("bedHeaters") or []
+        if bed_heaters:
+            heater_indices["bed"] = bed_heaters[0]
+        tool_heaters = status.tools[0].get("heaters") if status.tools and status.tools[0] else None
+        if tool_heaters:
+            heater_indices["tool0"] = tool_heaters[0]
+        readings = {}
+        for name, index in heater_indices.items():
+            if index is None or not 0 <= index < len(heaters) or not heaters[index]:
+                continue
+            heater = heaters[index]
+            readings[name] = TemperatureReading.model_construct(
+                actual=heater.get("current", 0.0),
+                target=heater.get("active"),
+                offset=None
+            )
+        return readings
 
-    def get_job_info(self) -> JobInfoResponse:
+    @staticmethod
+    def _extract_nozzle_bed(temps: Dict[str, TemperatureReading],
+                            default: Optional[float] = None) -> Tuple[Optional[float], ...]:
+        """
+        Pull the nozzle and bed readings out of a temperature mapping.
+
+        Args:
+            temps (Dict[str, TemperatureReading]): Readings keyed by 'tool0' and 'bed'
+            default (Optional[float]): Value used for a missing heater
+
+        Returns:
+            Tuple[Optional[float], ...]: (nozzle_actual, nozzle_target, bed_actual, bed_target)
+        """
+        tool0 = temps.get("tool0")
+        bed = temps.get("bed")
+        nozzle = (tool0.actual, tool0.target) if tool0 else (default, default)
+        return nozzle + ((bed.actual, bed.target) if bed else (default, default))
+
+    async def get_job_info(self) -> JobInfoResponse:
         """
         Retrieve information about the current print job.
         
@@ -41,16 +225,46 @@ class duet3DClient:
                            and print statistics
             
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        resp = requests.get(f"{self.base_url}/api/job",
-                            headers=self.headers,
-                            timeout=10)
-        resp.raise_for_status()
-        return JobInfoResponse(**resp.json())
+        return self._job_info_from_status(await self._fetch_status())
+
+    async def _post_job(self, command: str, retries: int = JOB_COMMAND_RETRIES) -> None:
+        """
+        Send a job command, retrying with exponential backoff while the printer is busy.
+
+        Commands are serialized through a lock, so concurrent callers do not
+        hammer the board while it is changing state.
 
-    def cancel_job(self) -> None:
+        Args:
+            command (str): The job command, e.g. 'cancel' or 'pause'
+            retries (int): Number of retries after the first busy response
+
+        Raises:
+            PrinterBusyError: If the printer is still busy after all retries
+            httpx.HTTPStatusError: If the API request fails for another reason
+            httpx.TimeoutException: If the request times out
+        """
+        async with self._job_lock:
+            try:
+                for attempt in range(retries + 1):
+                    resp = await self.http_client.post(
+                        self._url_job,
+                        headers=self._request_headers,
+                        json={"command": command}
+                    )
+                    if resp.status_code not in BUSY_STATUS_CODES:
+                        resp.raise_for_status()
+                        return
+                    if attempt < retries:
+                        await asyncio.sleep(JOB_COMMAND_BACKOFF_S * 2 ** attempt)
+                raise PrinterBusyError(
+                    f"Printer busy ({resp.status_code}) while sending '{command}'")
+            finally:
+                self.invalidate()
+
+    async def cancel_job(self) -> None:
         """
         Cancel the currently running print job.
         
@@ -58,20 +272,13 @@ class duet3DClient:
         to an idle state.
         
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            PrinterBusyError: If the printer stays busy through all retries
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        resp = requests.post(
-            f"{self.base_url}/api/job",
-            headers=self.headers,
-            timeout=10,
-            json={"command": "cancel"}
-        )
-        if resp.status_code == 204:
-            return
-        resp.raise_for_status()
+        await self._post_job("cancel")
 
-    def pause_job(self) -> None:
+    async def pause_job(self) -> None:
         """
         Pause the currently running print job.
         
@@ -79,42 +286,28 @@ class duet3DClient:
         resumed later.
         
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            PrinterBusyError: If the printer stays busy through all retries
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        resp = requests.post(
-            f"{self.base_url}/api/job",
-            headers=self.headers,
-            timeout=10,
-            json={"command": "pause"}
-        )
-        if resp.status_code == 204:
-            return
-        resp.raise_for_status()
+        await self._post_job("pause")
 
-    def get_printer_temperatures(self) -> Dict[str, TemperatureReading]:
+    async def get_printer_temperatures(self) -> Dict[str, TemperatureReading]:
         """
         Retrieve current temperature readings from all printer components.
         
         Returns:
             Dict[str, TemperatureReading]: Dictionary mapping component names
                                          (e.g., 'tool0', 'bed') to their temperature readings.
-                                         Returns empty dict if printer is not operational.
+                                         Returns empty dict if no heaters are configured.
             
         Raises:
-            requests.HTTPError: If the API request fails (except for 409 conflicts)
-            requests.Timeout: If the request times out
-        """
-        resp = requests.get(f"{self.base_url}/api/printer",
-                            headers=self.headers,
-                            timeout=10)
-        if resp.status_code == 409:
-            return {}
-        resp.raise_for_status()
-        state = TemperatureReadings(**resp.json())
-        return state.temperature
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
+        """
+        return self._temperatures_from_status(await self._fetch_status())
 
-    def percent_complete(self) -> float:
+    async def percent_complete(self) -> float:
         """
         Get the completion percentage of the current print job.
         
@@ -122,12 +315,13 @@ class duet3DClient:
             float: Completion percentage (0.0 to 100.0)
             
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        return self.get_job_info().progress.completion * 100
+        completion = (await self.get_job_info()).progress.completion
+        return completion if completion is not None else 0.0
 
-    def current_file(self) -> FileInfo:
+    async def current_file(self) -> FileInfo:
         """
         Get information about the currently loaded file.
         
@@ -136,12 +330,12 @@ class duet3DClient:
                      size, and other metadata
             
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        return self.get_job_info().job["file"]
+        return (await self.get_job_info()).job["file"]
 
-    def nozzle_and_bed_temps(self) -> Dict[str, float]:
+    async def nozzle_and_bed_temps(self) -> Dict[str, float]:
         """
         Get simplified temperature readings for nozzle and bed.
         
@@ -157,55 +351,42 @@ class duet3DClient:
                 - 'bed_target': Target bed temperature
                 Returns 0.0 for all values if temperatures are unavailable.
         """
-        temps = self.get_printer_temperatures()
-        if not temps:
-            return {
-                "nozzle_actual": 0.0,
-                "nozzle_target": 0.0,
-                "bed_actual": 0.0,
-                "bed_target": 0.0,
-            }
-        tool0 = temps.get("tool0")
-        bed   = temps.get("bed")
+        nozzle_actual, nozzle_target, bed_actual, bed_target = self._extract_nozzle_bed(
+            await self.get_printer_temperatures(), default=0.0)
         return {
-            "nozzle_actual": tool0.actual if tool0 else 0.0,
-            "nozzle_target": tool0.target if tool0 else 0.0,
-            "bed_actual"   : bed.actual if bed else 0.0,
-            "bed_target"   : bed.target if bed else 0.0,
+            "nozzle_actual": nozzle_actual,
+            "nozzle_target": nozzle_target,
+            "bed_actual"   : bed_actual,
+            "bed_target"   : bed_target,
         }
 
-    def get_printer_state(self) -> PrinterState:
+    async def get_printer_state(self) -> PrinterState:
         """
         Get comprehensive printer state information.
         
-        This method combines job information and temperature readings into
-        a unified printer state object, providing a complete snapshot of
-        the printer's current status.
+        Job information and temperature readings are both derived from a single
+        object model request, providing a complete snapshot of the printer's
+        current status.
         
         Returns:
             PrinterState: Complete printer state including job information
-                         and temperature readings. Job info may be None if
-                         retrieval fails.
-                         
-        Note:
-            If job information retrieval fails, the jobInfoResponse field
-            will be None, but temperature data will still be included if available.
-        """
-        temperature_readings = self.get_printer_temperatures()
-        tool0_temp = temperature_readings.get("tool0") if temperature_readings else None
-        bed_temp = temperature_readings.get("bed") if temperature_readings else None
-        printer_temps: PrinterTemperatures = PrinterTemperatures(
-            nozzle_actual=tool0_temp.actual if tool0_temp else None,
-            nozzle_target=tool0_temp.target if tool0_temp else None,
-            bed_actual=bed_temp.actual if bed_temp else None,
-            bed_target=bed_temp.target if bed_temp else None
+                         and temperature readings.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
+        """
+        status = await self._fetch_status()
+        nozzle_actual, nozzle_target, bed_actual, bed_target = self._extract_nozzle_bed(
+            self._temperatures_from_status(status))
+        printer_temps: PrinterTemperatures = PrinterTemperatures.model_construct(
+            nozzle_actual=nozzle_actual,
+            nozzle_target=nozzle_target,
+            bed_actual=bed_actual,
+            bed_target=bed_target
         )
-        try:
-            job_info = self.get_job_info()
-        except Exception:
-            job_info = None
-        printer_state = PrinterState(
-            jobInfoResponse=job_info,
+        printer_state = PrinterState.model_construct(
+            jobInfoResponse=self._job_info_from_status(status),
             temperatureReading=printer_temps
         )
         return printer_state
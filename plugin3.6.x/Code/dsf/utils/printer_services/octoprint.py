@@ -1,9 +1,13 @@
+import asyncio
 from typing import Dict
-import requests
-from models import (FileInfo, JobInfoResponse,
-                       TemperatureReadings, TemperatureReading,
+import httpx
+import orjson
+from pydantic import TypeAdapter
+from models import (FileInfo, JobInfoResponse, TemperatureReading,
                        PrinterState, PrinterTemperatures)
 
+_TEMPERATURES_ADAPTER = TypeAdapter(Dict[str, TemperatureReading])
+
 
 class OctoPrintClient:
     """
@@ -16,23 +20,27 @@ class OctoPrintClient:
     Attributes:
         base_url (str): The base URL of the OctoPrint instance
         headers (dict): HTTP headers including API key for authentication
+        http_client (httpx.AsyncClient): Shared, pooled async client used for all requests
     """
     
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str, http_client: httpx.AsyncClient):
         """
         Initialize the OctoPrint client.
         
         Args:
             base_url (str): The base URL of the OctoPrint instance (e.g., 'http://octopi.local')
             api_key (str): The API key for authentication with OctoPrint
+            http_client (httpx.AsyncClient): Application-wide async HTTP client, usually
+                                             app.state.http_async_client
         """
         self.base_url = base_url.rstrip("/")
         self.headers = {
             "X-Api-Key": api_key,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
-    def get_job_info(self) -> JobInfoResponse:
+    async def get_job_info(self) -> JobInfoResponse:
         """
         Retrieve information about the current print job.
         
@@ -41,16 +49,14 @@ class OctoPrintClient:
                            and print statistics
             
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        resp = requests.get(f"{self.base_url}/api/job",
-                            headers=self.headers,
-                            timeout=10)
+        resp = await self.http_client.get(f"{self.base_url}/api/job", headers=self.headers)
         resp.raise_for_status()
         return JobInfoResponse(**resp.json())
 
-    def cancel_job(self) -> None:
+    async def cancel_job(self) -> None:
         """
         Cancel the currently running print job.
         
@@ -58,20 +64,19 @@ class OctoPrintClient:
         to an idle state.
         
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        resp = requests.post(
+        resp = await self.http_client.post(
             f"{self.base_url}/api/job",
             headers=self.headers,
-            timeout=10,
             json={"command": "cancel"}
         )
         if resp.status_code == 204:
             return
         resp.raise_for_status()
 
-    def pause_job(self) -> None:
+    async def pause_job(self) -> None:
         """
         Pause the currently running print job.
         
@@ -79,20 +84,19 @@ class OctoPrintClient:
         resumed later.
         
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        resp = requests.post(
+        resp = await self.http_client.post(
             f"{self.base_url}/api/job",
             headers=self.headers,
-            timeout=10,
             json={"command": "pause"}
         )
         if resp.status_code == 204:
             return
         resp.raise_for_status()
 
-    def get_printer_temperatures(self) -> Dict[str, TemperatureReading]:
+    async def get_printer_temperatures(self) -> Dict[str, TemperatureReading]:
         """
         Retrieve current temperature readings from all printer components.
         
@@ -102,19 +106,17 @@ class OctoPrintClient:
                                          Returns empty dict if printer is not operational.
             
         Raises:
-            requests.HTTPError: If the API request fails (except for 409 conflicts)
-            requests.Timeout: If the request times out
+            httpx.HTTPStatusError: If the API request fails (except for 409 conflicts)
+            httpx.TimeoutException: If the request times out
         """
-        resp = requests.get(f"{self.base_url}/api/printer",
-                            headers=self.headers,
-                            timeout=10)
+        resp = await self.http_client.get(f"{self.base_url}/api/printer",
+                                          headers=self.headers)
         if resp.status_code == 409:
             return {}
         resp.raise_for_status()
-        state = TemperatureReadings(**resp.json())
-        return state.temperature
+        return _TEMPERATURES_ADAPTER.validate_python(orjson.loads(resp.content)["temperature"])
 
-    def percent_complete(self) -> float:
+    async def percent_complete(self) -> float:
         """
         Get the completion percentage of the current print job.
         
@@ -122,12 +124,12 @@ class OctoPrintClient:
             float: Completion percentage (0.0 to 100.0)
             
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        return self.get_job_info().progress.completion * 100
+        return (await self.get_job_info()).progress.completion * 100
 
-    def current_file(self) -> FileInfo:
+    async def current_file(self) -> FileInfo:
         """
         Get information about the currently loaded file.
         
@@ -136,12 +138,12 @@ class OctoPrintClient:
                      size, and other metadata
             
         Raises:
-            requests.HTTPError: If the API request fails
-            requests.Timeout: If the request times out
+            httpx.HTTPStatusError: If the API request fails
+            httpx.TimeoutException: If the request times out
         """
-        return self.get_job_info().job["file"]
+        return (await self.get_job_info()).job["file"]
 
-    def nozzle_and_bed_temps(self) -> Dict[str, float]:
+    async def nozzle_and_bed_temps(self) -> Dict[str, float]:
         """
         Get simplified temperature readings for nozzle and bed.
         
@@ -157,7 +159,7 @@ class OctoPrintClient:
                 - 'bed_target': Target bed temperature
                 Returns 0.0 for all values if temperatures are unavailable.
         """
-        temps = self.get_printer_temperatures()
+        temps = await self.get_printer_temperatures()
         if not temps:
             return {
                 "nozzle_actual": 0.0,
@@ -174,13 +176,13 @@ class OctoPrintClient:
             "bed_target"   : bed.target if bed else 0.0,
         }
 
-    def get_printer_state(self) -> PrinterState:
+    async def get_printer_state(self) -> PrinterState:
         """
         Get comprehensive printer state information.
         
-        This method combines job information and temperature readings into
-        a unified printer state object, providing a complete snapshot of
-        the printer's current status.
+        This method fetches job information and temperature readings concurrently
+        and combines them into a unified printer state object, providing a
+        complete snapshot of the printer's current status.
         
         Returns:
             PrinterState: Complete printer state including job information
@@ -191,7 +193,15 @@ class OctoPrintClient:
             If job information retrieval fails, the jobInfoResponse field
             will be None, but temperature data will still be included if available.
         """
-        temperature_readings = self.get_printer_temperatures()
+        temperature_readings, job_info = await asyncio.gather(
+            self.get_printer_temperatures(),
+            self.get_job_info(),
+            return_exceptions=True
+        )
+        if isinstance(temperature_readings, BaseException):
+            raise temperature_readings
+        if isinstance(job_info, BaseException):
+            job_info = None
         tool0_temp = temperature_readings.get("tool0") if temperature_readings else None
         bed_temp = temperature_readings.get("bed") if temperature_readings else None
         printer_temps: PrinterTemperatures = PrinterTemperatures(
@@ -200,10 +210,6 @@ class OctoPrintClient:
             bed_actual=bed_temp.actual if bed_temp else None,
             bed_target=bed_temp.target if bed_temp else None
         )
-        try:
-            job_info = self.get_job_info()
-        except Exception:
-            job_info = None
         printer_state = PrinterState(
             jobInfoResponse=job_info,
             temperatureReading=printer_temps
@@ -1,13 +1,42 @@
 import asyncio
 import logging
 
-import requests
+import httpx
 
-from models import PollingTask, SavedConfig, AlertAction
+from models import SavedConfig, AlertAction
 from utils.camera_utils import get_camera_state_sync, update_camera_state
 from utils.config import PRINTER_STAT_POLLING_RATE_MS, get_config
 from utils.printer_services.octoprint import OctoPrintClient
-from utils.sse_utils import add_polling_task, sse_update_printer_state
+from utils.sse_utils import add_polled_printer, sse_update_printer_state
+from utils.app_ref import get_app
+
+def get_octoprint_client(base_url, api_key):
+    """Return the cached OctoPrint client for a printer, creating it on first use.
+
+    Args:
+        base_url (str): The base URL of the OctoPrint instance.
+        api_key (str): The API key for the OctoPrint instance.
+
+    Returns:
+        OctoPrintClient: A long-lived client whose connection pool is reused.
+    """
+    app = get_app()
+    key = f"{base_url}|{api_key}"
+    client = app.state.octoprint_clients.get(key)
+    if client is None:
+        client = OctoPrintClient(base_url, api_key, app.state.http_async_client)
+        app.state.octoprint_clients[key] = client
+    return client
+
+def drop_octoprint_client(base_url, api_key):
+    """Remove a cached OctoPrint client.
+
+    Args:
+        base_url (str): The base URL of the OctoPrint instance.
+        api_key (str): The API key for the OctoPrint instance.
+    """
+    app = get_app()
+    app.state.octoprint_clients.pop(f"{base_url}|{api_key}", None)
 
 def get_printer_config(camera_uuid):
     """Retrieve printer configuration from camera state.
@@ -74,49 +103,61 @@ async def remove_printer(camera_uuid):
         "printer_config": None
     })
 
-async def poll_printer_state_func(client, interval, stop_event):
-    """Continuously poll the printer state and send updates via SSE.
+def _get_polling_interval():
+    """Return the configured printer polling interval in seconds."""
+    config = get_config() or {}
+    return float(config.get(
+        SavedConfig.PRINTER_STAT_POLLING_RATE_MS, PRINTER_STAT_POLLING_RATE_MS
+        ) / 1000)
 
-    Args:
-        client (OctoPrintClient): The client to query printer status.
-        interval (float): Time in seconds between polls.
-        stop_event (asyncio.Event): An event to signal polling should stop.
+async def poll_all_printers():
+    """Poll every registered printer concurrently and send updates via SSE.
+
+    Each tick gathers get_printer_state over all distinct clients, so the
+    tick costs one round-trip regardless of how many printers are polled.
+    The loop exits once no printers remain registered.
     """
-    while not stop_event.is_set():
-        try:
-            current_printer_state = client.get_printer_state()
-            await sse_update_printer_state(current_printer_state)
-        except (requests.exceptions.RequestException, ConnectionError,
-                TimeoutError, ValueError) as e:
-            logging.warning("Error polling printer state: %s", str(e))
-        except Exception as e:
-            logging.error("Unexpected error polling printer state: %s", str(e))
-        await asyncio.sleep(interval)
+    app = get_app()
+    try:
+        while app.state.polled_printers:
+            clients = list(dict.fromkeys(app.state.polled_printers.values()))
+            results = await asyncio.gather(
+                *(client.get_printer_state() for client in clients),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, (httpx.HTTPError, ConnectionError,
+                                       TimeoutError, ValueError)):
+                    logging.warning("Error polling printer state: %s", str(result))
+                elif isinstance(result, Exception):
+                    logging.error("Unexpected error polling printer state: %s", str(result))
+                else:
+                    await sse_update_printer_state(result)
+            await asyncio.sleep(_get_polling_interval())
+    finally:
+        app.state.printer_poll_task = None
 
 async def start_printer_state_polling(camera_uuid):
-    """Start background polling of printer state for a camera.
+    """Register a camera's printer with the shared background poller.
 
     Args:
         camera_uuid (str): The UUID of the camera to poll.
     """
-    stop_event = asyncio.Event()
     camera_printer_config = get_printer_config(camera_uuid)
     if not camera_printer_config:
         logging.warning("No printer configuration found for camera UUID %s", camera_uuid)
         return
-    config = get_config()
-    printer_polling_rate = float(config.get(
-        SavedConfig.PRINTER_STAT_POLLING_RATE_MS, PRINTER_STAT_POLLING_RATE_MS
-        ) / 1000)
-    client = OctoPrintClient(
+    client = get_octoprint_client(
         camera_printer_config.get('base_url'),
         camera_printer_config.get('api_key')
     )
-    task = asyncio.create_task(poll_printer_state_func(client, printer_polling_rate, stop_event))
-    add_polling_task(camera_uuid, PollingTask(task=task, stop_event=stop_event))
+    add_polled_printer(camera_uuid, client)
+    app = get_app()
+    if app.state.printer_poll_task is None:
+        app.state.printer_poll_task = asyncio.create_task(poll_all_printers())
     logging.debug("Started printer state polling for camera UUID %s", camera_uuid)
 
-def suspend_print_job(camera_uuid, action: AlertAction):
+async def suspend_print_job(camera_uuid, action: AlertAction):
     """Pause or cancel an ongoing print job based on an alert action.
 
     Args:
@@ -129,22 +170,22 @@ def suspend_print_job(camera_uuid, action: AlertAction):
     printer_config = get_printer_config(camera_uuid)
     if printer_config:
         if printer_config['printer_type'] == 'octoprint':
-            client = OctoPrintClient(
+            client = get_octoprint_client(
                 printer_config['base_url'],
                 printer_config['api_key']
             )
             try:
-                job_info = client.get_job_info()
+                job_info = await client.get_job_info()
                 if job_info.state != "Printing":
                     return True
                 match action:
                     case AlertAction.CANCEL_PRINT:
-                        client.cancel_job()
+                        await client.cancel_job()
                         logging.debug("Print cancelled for printer %s on camera %s",
                                         printer_config['name'], camera_uuid)
                         return True
                     case AlertAction.PAUSE_PRINT:
-                        client.pause_job()
+                        await client.pause_job()
                         logging.debug("Print paused for printer %s on camera %s",
                                         printer_config['name'], camera_uuid)
                         return True
@@ -5,6 +5,19 @@ from models import SavedConfig, SavedKey, SiteStartupMode
 from utils.config import SSL_CERT_FILE, get_config, get_key
 
 
+def normalize_domain(domain: str) -> str:
+    """
+    Strip an http(s) scheme and a trailing slash from a domain.
+
+    Args:
+        domain (str): A bare domain or a base URL such as 'https://example.com/'.
+
+    Returns:
+        str: The domain without scheme or trailing slash.
+    """
+    return domain.removeprefix('https://').removeprefix('http://').removesuffix('/')
+
+
 def setup_ngrok_tunnel(close: bool = False) -> bool:
     """
     Start a ngrok tunnel at port 8000 using the provided auth key and domain.
@@ -1,11 +1,15 @@
+import asyncio
 import logging
 import threading
 import time
-from typing import Dict, Optional, List, Callable
+from typing import Dict, Optional, List, Callable, Tuple
 import cv2
 import numpy as np
 
-from utils.camera_utils import get_camera_state_sync
+from utils.camera_utils import get_camera_state_sync, get_capture_backend
+from utils.jpeg_utils import encode_jpeg
+
+JPEG_SOI = b"\xff\xd8"
 
 
 class SharedVideoStream:
@@ -17,6 +21,11 @@ class SharedVideoStream:
         self.source = source
         self.cap: Optional[cv2.VideoCapture] = None
         self.latest_frame: Optional[np.ndarray] = None
+        self.latest_jpeg: Optional[bytes] = None
+        self.passthrough = False
+        self._encoded: Tuple[int, int, Optional[bytes]] = (-1, 0, None)
+        self._encode_lock = threading.Lock()
+        self._frame_listeners: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
         self.frame_lock = threading.Lock()
         self.consumers: List[Callable] = []
         self.is_running = False
@@ -49,13 +58,14 @@ class SharedVideoStream:
             source = self.source
             if isinstance(source, str) and source.isdigit():
                 source = int(source)
-            self.cap = cv2.VideoCapture(source, cv2.CAP_ANY)
+            self.cap = cv2.VideoCapture(source, get_capture_backend(source))
             if not self.cap.isOpened():
                 logging.error("Failed to open camera source %s for shared stream", source)
                 return
             self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             if isinstance(source, str) and source.startswith('rtp://'):
                 self.cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 5000)
+            self.passthrough = self._enable_mjpeg_passthrough(source)
             consecutive_failures = 0
             max_consecutive_failures = 10
             while self.is_running:
@@ -73,10 +83,27 @@ class SharedVideoStream:
                     continue
                 else:
                     consecutive_failures = 0
-                with self.frame_lock:
-                    self.latest_frame = frame.copy()
-                    self.last_frame_time = time.time()
-                    self.frame_count += 1
+                if self.passthrough:
+                    jpeg = frame.tobytes()
+                    if jpeg[:2] != JPEG_SOI:
+                        logging.warning("Camera %s returned a non-JPEG buffer, decoding frames",
+                                        self.camera_uuid)
+                        self.passthrough = False
+                        self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+                        with self.frame_lock:
+                            self.latest_jpeg = None
+                        continue
+                    with self.frame_lock:
+                        self.latest_jpeg = jpeg
+                        self.latest_frame = None
+                        self.last_frame_time = time.monotonic()
+                        self.frame_count += 1
+                else:
+                    with self.frame_lock:
+                        self.latest_frame = frame.copy()
+                        self.last_frame_time = time.monotonic()
+                        self.frame_count += 1
+                self._notify_frame_listeners()
                 time.sleep(0.001)
         except (cv2.error, OSError, ValueError) as e:
             logging.error("Error in shared video stream for camera %s: %s", self.camera_uuid, e)
@@ -84,17 +111,118 @@ class SharedVideoStream:
             if self.cap and self.cap.isOpened():
                 self.cap.release()
 
+    def _enable_mjpeg_passthrough(self, source) -> bool:
+        """Keep the camera's own JPEG frames when it captures MJPEG.
+
+        With CAP_PROP_CONVERT_RGB disabled, V4L2 returns each MJPEG frame
+        undecoded, so JPEG consumers can forward it as-is and frames are only
+        decoded when a consumer asks for BGR pixels.
+
+        Args:
+            source (int | str): The opened camera source.
+
+        Returns:
+            bool: True if frames are captured as raw JPEG buffers.
+        """
+        # pylint: disable=E1101
+        if get_capture_backend(source) != cv2.CAP_V4L2:
+            return False
+        fourcc = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        if fourcc != cv2.VideoWriter_fourcc(*'MJPG'):
+            return False
+        if not self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+            return False
+        logging.debug("Forwarding native MJPEG frames for camera %s", self.camera_uuid)
+        return True
+
     def get_frame(self) -> Optional[np.ndarray]:
-        """Get the latest frame from the shared stream."""
+        """Get the latest frame from the shared stream.
+
+        In passthrough mode the latest JPEG is decoded on first request and
+        the result is shared by every consumer of that frame.
+        """
+        # pylint: disable=E1101
         with self.frame_lock:
+            if self.latest_frame is None and self.latest_jpeg is not None:
+                self.latest_frame = cv2.imdecode(
+                    np.frombuffer(self.latest_jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
             if self.latest_frame is not None:
                 return self.latest_frame.copy()
             return None
 
+    def add_frame_listener(self, event: asyncio.Event):
+        """Set event from the capture thread whenever a new frame arrives.
+
+        Must be called from the event loop that awaits the event.
+
+        Args:
+            event (asyncio.Event): The event to set on each new frame.
+        """
+        with self.frame_lock:
+            self._frame_listeners.append((asyncio.get_running_loop(), event))
+
+    def remove_frame_listener(self, event: asyncio.Event):
+        """Stop notifying an event registered with add_frame_listener."""
+        with self.frame_lock:
+            self._frame_listeners = [
+                (loop, listener) for loop, listener in self._frame_listeners
+                if listener is not event
+            ]
+
+    def _notify_frame_listeners(self):
+        """Wake every listening coroutine from the capture thread."""
+        with self.frame_lock:
+            listeners = list(self._frame_listeners)
+        for loop, event in listeners:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The listener's loop has closed
+                self.remove_frame_listener(event)
+
+    def get_encoded_jpeg(self, quality: int) -> Optional[bytes]:
+        """Get the latest frame as JPEG, encoding it at most once per frame.
+
+        The camera's own JPEG is returned in passthrough mode. Otherwise the
+        first caller for a new frame encodes it and later callers, whatever
+        their number, reuse that encoding.
+
+        Args:
+            quality (int): JPEG quality used when the frame has to be encoded.
+
+        Returns:
+            Optional[bytes]: The JPEG bytes, or None if no frame is available.
+        """
+        jpeg = self.get_jpeg()
+        if jpeg is not None:
+            return jpeg
+        with self._encode_lock:
+            with self.frame_lock:
+                frame_count = self.frame_count
+            encoded_count, encoded_quality, encoded = self._encoded
+            if encoded_count == frame_count and encoded_quality == quality:
+                return encoded
+            frame = self.get_frame()
+            if frame is None:
+                return None
+            encoded = encode_jpeg(frame, quality=quality)
+            self._encoded = (frame_count, quality, encoded)
+            return encoded
+
+    def get_jpeg(self) -> Optional[bytes]:
+        """Get the latest frame exactly as the camera encoded it.
+
+        Returns:
+            Optional[bytes]: The JPEG bytes, or None if the camera does not
+                deliver MJPEG.
+        """
+        with self.frame_lock:
+            return self.latest_jpeg
+
     def is_frame_available(self) -> bool:
         """Check if a frame is available."""
         with self.frame_lock:
-            return self.latest_frame is not None
+            return self.latest_frame is not None or self.latest_jpeg is not None
 
     def get_frame_info(self) -> Dict:
         """Get information about the current frame."""
@@ -102,9 +230,9 @@ class SharedVideoStream:
             return {
                 'frame_count': self.frame_count,
                 'last_frame_time': self.last_frame_time,
-                'has_frame': self.latest_frame is not None,
+                'has_frame': self.latest_frame is not None or self.latest_jpeg is not None,
                 'is_running': self.is_running,
-                'is_healthy': self.is_running and time.time() - self.last_frame_time < 5.0
+                'is_healthy': self.is_running and time.monotonic() - self.last_frame_time < 5.0
             }
 
 
@@ -114,28 +242,49 @@ class SharedVideoStreamManager:
     def __init__(self):
         self.streams: Dict[str, SharedVideoStream] = {}
         self.lock = threading.Lock()
+        self._ref_counts: Dict[str, int] = {}
 
     def get_stream(self, camera_uuid: str, source: str) -> SharedVideoStream:
         """Get or create a shared video stream for a camera."""
         with self.lock:
-            if camera_uuid not in self.streams:
+            return self._get_stream_locked(camera_uuid, source)
+
+    def _get_stream_locked(self, camera_uuid: str, source: str) -> SharedVideoStream:
+        """Get or create a stream; the caller must hold self.lock."""
+        if camera_uuid not in self.streams:
+            self.streams[camera_uuid] = SharedVideoStream(camera_uuid, source)
+        else:
+            existing_stream = self.streams[camera_uuid]
+            if (not existing_stream.is_running
+                or not existing_stream.thread
+                or not existing_stream.thread.is_alive()):
+                logging.info("Restarting shared video stream for camera %s", camera_uuid)
+                existing_stream.stop()
                 self.streams[camera_uuid] = SharedVideoStream(camera_uuid, source)
-            else:
-                existing_stream = self.streams[camera_uuid]
-                if (not existing_stream.is_running
-                    or not existing_stream.thread
-                    or not existing_stream.thread.is_alive()):
-                    logging.info("Restarting shared video stream for camera %s", camera_uuid)
-                    existing_stream.stop()
-                    self.streams[camera_uuid] = SharedVideoStream(camera_uuid, source)
-            stream = self.streams[camera_uuid]
-            if not stream.is_running:
-                stream.start()
+        stream = self.streams[camera_uuid]
+        if not stream.is_running:
+            stream.start()
+        return stream
+
+    def acquire_stream(self, camera_uuid: str, source: str) -> SharedVideoStream:
+        """Get a stream and count the caller as one of its holders.
+
+        Each call must be paired with release_stream; the stream stops once
+        its last holder releases it.
+        """
+        with self.lock:
+            stream = self._get_stream_locked(camera_uuid, source)
+            self._ref_counts[camera_uuid] = self._ref_counts.get(camera_uuid, 0) + 1
             return stream
 
     def release_stream(self, camera_uuid: str):
         """Release a shared video stream."""
         with self.lock:
+            if camera_uuid in self._ref_counts:
+                self._ref_counts[camera_uuid] -= 1
+                if self._ref_counts[camera_uuid] > 0:
+                    return
+                del self._ref_counts[camera_uuid]
             if camera_uuid in self.streams:
                 self.streams[camera_uuid].stop()
                 del self.streams[camera_uuid]
@@ -146,6 +295,7 @@ class SharedVideoStreamManager:
             for stream in self.streams.values():
                 stream.stop()
             self.streams.clear()
+            self._ref_counts.clear()
 
     def get_stream_health(self, camera_uuid: str) -> Dict:
         """Get health information for a specific stream."""
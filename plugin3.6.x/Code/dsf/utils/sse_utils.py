@@ -1,26 +1,80 @@
 import asyncio
-import json
 import logging
 import time
 
-from models import (SSEDataType, PrinterState,
-                      PollingTask, SavedConfig)
+import orjson
+
+from models import SSEDataType, PrinterState, SavedConfig
 from utils.config import get_config, MIN_SSE_DISPATCH_DELAY_MS
+from utils.app_ref import get_app
 
 _last_dispatch_times = {}
 
+class SSEBatcher:
+    """Coalesces events published within MIN_SSE_DISPATCH_DELAY_MS into one write.
+
+    Events are JSON strings; each flush joins the pending ones into a single JSON
+    array and puts it once on every subscriber queue.
+    """
+
+    def __init__(self, subscribers):
+        """Initialize the batcher.
+
+        Args:
+            subscribers (set[asyncio.Queue]): Queues that receive flushed batches.
+        """
+        self._subscribers = subscribers
+        self._pending = []
+        self._flush_handle = None
+
+    def add(self, event_json):
+        """Queue an event and schedule a flush if none is pending.
+
+        Args:
+            event_json (str): The JSON-serialized event.
+        """
+        self._pending.append(event_json)
+        if self._flush_handle is None:
+            delay_ms = get_config().get(SavedConfig.MIN_SSE_DISPATCH_DELAY_MS,
+                                        MIN_SSE_DISPATCH_DELAY_MS)
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                delay_ms / 1000, self._flush)
+
+    def _flush(self):
+        """Write all pending events to each subscriber as one batch."""
+        self._flush_handle = None
+        if not self._pending:
+            return
+        batch = "[" + ",".join(self._pending) + "]"
+        self._pending = []
+        for queue in self._subscribers:
+            queue.put_nowait(batch)
+
 async def outbound_packet_fetch():
     """Async generator yielding outbound SSE packets for clients.
 
     Yields:
         str: Serialized JSON packet from application outbound queue.
     """
-    # pylint: disable=C0415
-    from app import app
+    app = get_app()
     while True:
         packet = await app.state.outbound_queue.get()
         yield packet
 
+def _encode_packet(packet, sse_data_type: SSEDataType):
+    """Serialize an SSE packet envelope with orjson.
+
+    Args:
+        packet: The data payload. An orjson.Fragment is embedded as-is,
+            so already serialized models are not encoded twice.
+        sse_data_type (SSEDataType): The type of SSE event.
+
+    Returns:
+        str: The JSON encoded packet.
+    """
+    pkt = {"data": {"event": sse_data_type.value, "data": packet}}
+    return orjson.dumps(pkt).decode("utf-8")
+
 async def append_new_outbound_packet(packet, sse_data_type: SSEDataType):
     """Append a new Server-Sent Event packet to the outbound queue.
 
@@ -30,17 +84,15 @@ async def append_new_outbound_packet(packet, sse_data_type: SSEDataType):
     """
     config = get_config()
     min_sse_dispatch_delay = config.get(SavedConfig.MIN_SSE_DISPATCH_DELAY_MS, MIN_SSE_DISPATCH_DELAY_MS)
-    current_time = time.time() * 1000
+    current_time = time.monotonic() * 1000
     last_dispatch_time = _last_dispatch_times.get(sse_data_type, 0)
     time_since_last_dispatch = current_time - last_dispatch_time
     if time_since_last_dispatch < min_sse_dispatch_delay:
         logging.debug("Throttling SSE dispatch for %s (time since last: %.1fms)",
                      sse_data_type.value, time_since_last_dispatch)
         return
-    # pylint: disable=C0415
-    from app import app
-    pkt = {"data": {"event": sse_data_type.value, "data": packet}}
-    pkt_json = json.dumps(pkt)
+    app = get_app()
+    pkt_json = _encode_packet(packet, sse_data_type)
     await app.state.outbound_queue.put(pkt_json)
     _last_dispatch_times[sse_data_type] = current_time
 
@@ -51,12 +103,10 @@ async def append_new_outbound_packet_force(packet, sse_data_type: SSEDataType):
         packet (str): The JSON-serialized data payload.
         sse_data_type (SSEDataType): The type of SSE event.
     """
-    # pylint: disable=C0415
-    from app import app
-    pkt = {"data": {"event": sse_data_type.value, "data": packet}}
-    pkt_json = json.dumps(pkt)
+    app = get_app()
+    pkt_json = _encode_packet(packet, sse_data_type)
     await app.state.outbound_queue.put(pkt_json)
-    current_time = time.time() * 1000
+    current_time = time.monotonic() * 1000
     _last_dispatch_times[sse_data_type] = current_time
 
 def reset_throttle_for_data_type(sse_data_type: SSEDataType):
@@ -73,16 +123,15 @@ def _calculate_frame_rate(detection_history):
     """Calculate frames per second based on detection timestamps.
 
     Args:
-        detection_history (list of tuples): Each tuple is (timestamp, label).
+        detection_history (deque of tuples): Each tuple is (timestamp, label).
 
     Returns:
         float: The calculated frame rate, or 0.0 if insufficient data.
     """
     if len(detection_history) < 2:
         return 0.0
-    times = [t for t, _ in detection_history]
-    duration = times[-1] - times[0]
-    return (len(times) - 1) / duration if duration > 0 else 0.0
+    duration = detection_history[-1][0] - detection_history[0][0]
+    return (len(detection_history) - 1) / duration if duration > 0 else 0.0
 
 async def _sse_update_camera_state_func(camera_uuid):
     """Build and send a camera state update SSE packet.
@@ -116,7 +165,8 @@ async def sse_update_printer_state(printer_state: PrinterState):
     """
     try:
         await asyncio.wait_for(
-            append_new_outbound_packet(printer_state.model_dump(), SSEDataType.PRINTER_STATE),
+            append_new_outbound_packet(orjson.Fragment(printer_state.model_dump_json()),
+                                       SSEDataType.PRINTER_STATE),
             timeout=5.0
         )
     except asyncio.TimeoutError:
@@ -142,47 +192,79 @@ async def sse_update_camera_state(camera_uuid):
         logging.error("Unexpected error in SSE camera state update for camera %s: %s",
                       camera_uuid, e)
 
-def get_polling_task(camera_uuid):
-    """Retrieve the current polling task for a camera.
+def add_alert_subscriber():
+    """Register a new alert stream subscriber.
+
+    Returns:
+        asyncio.Queue: Queue receiving batches of alert events as JSON arrays.
+    """
+    app = get_app()
+    queue = asyncio.Queue()
+    app.state.alert_subscribers.add(queue)
+    return queue
+
+def remove_alert_subscriber(queue):
+    """Unregister an alert stream subscriber.
+
+    Args:
+        queue (asyncio.Queue): The queue returned by add_alert_subscriber.
+    """
+    app = get_app()
+    app.state.alert_subscribers.discard(queue)
+
+def has_alert_subscribers():
+    """Check whether any client is listening on the alert stream.
+
+    Returns:
+        bool: True if at least one subscriber is registered.
+    """
+    app = get_app()
+    return bool(app.state.alert_subscribers)
+
+def publish_alert_event(event):
+    """Push an alert mutation to every alert stream subscriber.
+
+    Args:
+        event (dict): The event payload, e.g. {"type": "dismissed", "id": str}.
+    """
+    app = get_app()
+    if not app.state.alert_subscribers:
+        return
+    app.state.alert_batcher.add(orjson.dumps(event).decode("utf-8"))
+
+def get_polled_printer(camera_uuid):
+    """Retrieve the printer client polled on behalf of a camera.
 
     Args:
         camera_uuid (str): The UUID of the camera.
 
     Returns:
-        PollingTask or None: The polling task if exists, otherwise None.
+        OctoPrintClient or None: The polled client if registered, otherwise None.
     """
-    # pylint: disable=C0415
-    from app import app
-    return app.state.polling_tasks.get(camera_uuid) or None
+    app = get_app()
+    return app.state.polled_printers.get(camera_uuid)
 
 def stop_and_remove_polling_task(camera_uuid):
-    """Stop and remove a polling task for a specified camera.
+    """Stop polling the printer of a specified camera.
+
+    The shared poller exits by itself once no printers remain registered.
 
     Args:
         camera_uuid (str): The UUID of the camera.
     """
-    # pylint: disable=C0415
-    from app import app
-    task = get_polling_task(camera_uuid)
-    if task:
-        task.stop_event.set()
-        if task.task and not task.task.done():
-            task.task.cancel()
-        logging.debug("Stopped polling task for camera UUID %s", camera_uuid)
-        del app.state.polling_tasks[camera_uuid]
+    app = get_app()
+    if app.state.polled_printers.pop(camera_uuid, None) is not None:
+        logging.debug("Stopped polling printer for camera UUID %s", camera_uuid)
     else:
         logging.warning("No polling task found for camera UUID %s to stop.", camera_uuid)
 
-def add_polling_task(camera_uuid, task: PollingTask):
-    """Add or replace a polling task for a camera.
+def add_polled_printer(camera_uuid, client):
+    """Add or replace the printer client polled for a camera.
 
     Args:
         camera_uuid (str): The UUID of the camera.
-        task (PollingTask): The task object containing the asyncio.Task and stop_event.
-    """
-    # pylint: disable=C0415
-    from ..app import app
-    if camera_uuid in app.state.polling_tasks:
-        stop_and_remove_polling_task(camera_uuid)
-    app.state.polling_tasks[camera_uuid] = task
-    logging.debug("Added polling task for camera UUID %s", camera_uuid)
+        client (OctoPrintClient): The client used to query the printer state.
+    """
+    app = get_app()
+    app.state.polled_printers[camera_uuid] = client
+    logging.debug("Added polled printer for camera UUID %s", camera_uuid)
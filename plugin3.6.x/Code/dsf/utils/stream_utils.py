@@ -12,6 +12,7 @@ from utils.sse_utils import sse_update_camera_state
 from utils.detection_utils import (_passed_majority_vote, _create_alert_and_notify,
                               _send_alert)
 from utils.camera_utils import get_camera_state_sync
+from utils.jpeg_utils import encode_jpeg
 from utils.shared_video_stream import get_shared_camera_frame
 from models import SavedConfig, SiteStartupMode
 from utils.config import (get_config, STREAM_MAX_FPS, STREAM_TUNNEL_FPS,
@@ -26,12 +27,12 @@ class StreamOptimizer:
     def __init__(self):
         """Initialize the stream optimizer with empty cache and timing."""
         self._config_cache = {}
-        self._last_config_check = 0
+        self._last_config_check = float('-inf')
         self._config_check_interval = 30.0
 
     def invalidate_cache(self):
         """Clear cached streaming settings to force re-read from configuration."""
-        self._last_config_check = 0
+        self._last_config_check = float('-inf')
         self._config_cache.clear()
 
     def _get_current_settings(self) -> Dict:
@@ -49,7 +50,7 @@ class StreamOptimizer:
                     'tunnel_provider': Optional[str]
                 }
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         if (current_time - self._last_config_check) > self._config_check_interval:
             config = get_config()
             startup_mode = config.get(SavedConfig.STARTUP_MODE, SiteStartupMode.LOCAL)
@@ -101,7 +102,7 @@ class StreamOptimizer:
         if max_fps <= 0:
             return False
         min_frame_interval = 1.0 / max_fps
-        return (time.time() - last_frame_time) < min_frame_interval
+        return (time.monotonic() - last_frame_time) < min_frame_interval
 
     def optimize_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, Dict]:
         """Resize frame based on max width and return associated settings.
@@ -133,18 +134,8 @@ class StreamOptimizer:
             bytes: The JPEG-encoded byte string.
         """
         settings = self._get_current_settings()
-        jpeg_quality = settings['jpeg_quality']
-        # pylint: disable=E1101
-        encode_params = [
-            cv2.IMWRITE_JPEG_QUALITY, jpeg_quality,
-            cv2.IMWRITE_JPEG_OPTIMIZE, 1,
-        ]
-        if settings['is_tunnel_mode']:
-            encode_params.extend([cv2.IMWRITE_JPEG_PROGRESSIVE, 1])
-        success, buffer = cv2.imencode('.jpg', frame, encode_params)
-        if not success:
-            _, buffer = cv2.imencode('.jpg', frame)
-        return buffer.tobytes()
+        return encode_jpeg(frame, quality=settings['jpeg_quality'],
+                           progressive=settings['is_tunnel_mode'], optimize=True)
 
     def get_detection_interval(self) -> float:
         """Get the time interval between detections in seconds."""
@@ -199,7 +190,7 @@ def create_optimized_frame_generator(camera_uuid: str, camera_state_getter):
                 frame = cv2.addWeighted(frame, 1.0 + focus, blurred, -focus, 0)
             frame, settings = stream_optimizer.optimize_frame(frame)
             frame_bytes = stream_optimizer.encode_frame(frame)
-            last_frame_time = time.time()
+            last_frame_time = time.monotonic()
             frame_count += 1
             yield (b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
             if frame_count % 300 == 0:
@@ -328,8 +319,7 @@ def generate_frames(camera_uuid: str):
                 if focus and focus != 1.0:
                     blurred = cv2.GaussianBlur(frame, (0, 0), sigmaX=focus)
                     frame = cv2.addWeighted(frame, 1.0 + focus, blurred, -focus, 0)
-                _, buffer = cv2.imencode('.jpg', frame)
-                frame_bytes = buffer.tobytes()
+                frame_bytes = encode_jpeg(frame)
                 yield (b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
         except Exception as fallback_e:
             logging.error("Error in fallback frame generation for camera %s: %s",
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from fractions import Fraction
+from typing import Dict
+
+from utils.app_ref import get_app
+from utils.shared_video_stream import get_shared_stream_manager
+
+try:
+    from aiortc import (RTCPeerConnection, RTCRtpSender,
+                        RTCSessionDescription, VideoStreamTrack)
+    import av
+except ImportError:
+    RTCPeerConnection = None
+    VideoStreamTrack = object
+
+# Frame rate the WebRTC track is clocked at
+WEBRTC_FPS = 15
+
+
+def is_webrtc_available() -> bool:
+    """Return True if aiortc and PyAV are installed."""
+    return RTCPeerConnection is not None
+
+
+class SharedStreamTrack(VideoStreamTrack):
+    """A video track that serves the latest frame of a shared camera stream."""
+
+    kind = "video"
+
+    def __init__(self, stream):
+        """Initialize the track.
+
+        Args:
+            stream (SharedVideoStream): The shared stream to read frames from.
+        """
+        super().__init__()
+        self._stream = stream
+        self._time_base = Fraction(1, WEBRTC_FPS)
+        self._pts = 0
+
+    async def recv(self):
+        """Return the next video frame, waiting for the camera if necessary.
+
+        Returns:
+            av.VideoFrame: The latest camera frame, timestamped for the track.
+        """
+        await asyncio.sleep(1 / WEBRTC_FPS)
+        frame = await asyncio.to_thread(self._stream.get_frame)
+        while frame is None:
+            await asyncio.sleep(0.1)
+            frame = await asyncio.to_thread(self._stream.get_frame)
+        video_frame = av.VideoFrame.from_ndarray(frame, format="bgr24")
+        video_frame.pts = self._pts
+        video_frame.time_base = self._time_base
+        self._pts += 1
+        return video_frame
+
+
+def _prefer_h264(transceiver):
+    """Move H.264 to the front of a transceiver's codec preferences."""
+    codecs = RTCRtpSender.getCapabilities("video").codecs
+    h264 = [codec for codec in codecs if codec.mimeType == "video/H264"]
+    others = [codec for codec in codecs if codec.mimeType != "video/H264"]
+    transceiver.setCodecPreferences(h264 + others)
+
+
+async def create_webrtc_answer(camera_uuid: str, source: str,
+                               sdp: str, sdp_type: str) -> Dict[str, str]:
+    """Answer a browser's WebRTC offer with a track for a camera.
+
+    The camera stream is acquired for the connection and released, and the
+    peer connection dropped from app.state.peer_connections, when it closes,
+    fails or negotiation raises.
+
+    Args:
+        camera_uuid (str): The UUID of the camera to stream.
+        source (str): The camera source.
+        sdp (str): The offer's session description.
+        sdp_type (str): The offer's type, normally 'offer'.
+
+    Returns:
+        Dict[str, str]: The answer's 'sdp' and 'type'.
+    """
+    app = get_app()
+    manager = get_shared_stream_manager()
+    stream = await asyncio.to_thread(manager.acquire_stream, camera_uuid, source)
+    pc = RTCPeerConnection()
+    app.state.peer_connections.add(pc)
+    released = False
+
+    def release():
+        nonlocal released
+        if not released:
+            released = True
+            manager.release_stream(camera_uuid)
+
+    @pc.on("connectionstatechange")
+    async def on_connectionstatechange():
+        if pc.connectionState in ("failed", "closed"):
+            logging.debug("WebRTC connection for camera %s %s", camera_uuid, pc.connectionState)
+            await pc.close()
+            app.state.peer_connections.discard(pc)
+            release()
+
+    try:
+        await pc.setRemoteDescription(RTCSessionDescription(sdp=sdp, type=sdp_type))
+        track = SharedStreamTrack(stream)
+        sender = pc.addTrack(track)
+        for transceiver in pc.getTransceivers():
+            if transceiver.sender is sender:
+                _prefer_h264(transceiver)
+                break
+        await pc.setLocalDescription(await pc.createAnswer())
+    except Exception:
+        await pc.close()
+        app.state.peer_connections.discard(pc)
+        release()
+        raise
+    return {"sdp": pc.localDescription.sdp, "type": pc.localDescription.type}
+
+
+async def close_peer_connections():
+    """Close every open WebRTC peer connection."""
+    app = get_app()
+    connections = list(app.state.peer_connections)
+    app.state.peer_connections.clear()
+    await asyncio.gather(*(pc.close() for pc in connections), return_exceptions=True)